@@ -0,0 +1,96 @@
+from collections import deque
+from typing import Generic, Iterator, Mapping, TypeVar
+
+
+T = TypeVar("T")
+
+
+class Automaton(Generic[T]):
+    def __init__(self, vocabulary: Mapping[str, T]) -> None:
+        assert all(len(word) > 0 for word in vocabulary)
+
+        # Trie of the vocabulary
+        goto: list[dict[str, int]] = [{}]
+        outputs: list[list[tuple[int, T]]] = [[]]
+        for word, value in vocabulary.items():
+            state = 0
+            for char in word:
+                if char not in goto[state]:
+                    goto.append({})
+                    outputs.append([])
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            outputs[state].append((len(word), value))
+
+        # Breadth-first over the trie: resolve failure links into a full transition
+        # table so that scanning never has to follow them
+        fail = [0] * len(goto)
+        self.delta: list[dict[str, int]] = [dict(goto[0])]
+        self.delta.extend({} for _ in range(len(goto) - 1))
+
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state].extend(outputs[fail[state]])
+
+            self.delta[state] = dict(self.delta[fail[state]])
+            for char, child in goto[state].items():
+                fail[child] = self.delta[fail[state]].get(char, 0)
+                self.delta[state][char] = child
+                queue.append(child)
+
+        self.outputs: list[tuple[tuple[int, T], ...]] = [tuple(o) for o in outputs]
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, T]]:
+        # Every (possibly overlapping) match as (start, value), ordered by end
+        delta = self.delta
+        outputs = self.outputs
+
+        state = 0
+        for idx, char in enumerate(text):
+            state = delta[state].get(char, 0)
+            for length, value in outputs[state]:
+                yield idx - length + 1, value
+
+    def first_and_last(self, text: str) -> tuple[T, T] | None:
+        delta = self.delta
+        outputs = self.outputs
+
+        first = None
+        last = None
+        first_start = len(text)
+        last_start = -1
+
+        state = 0
+        for idx, char in enumerate(text):
+            state = delta[state].get(char, 0)
+            for length, value in outputs[state]:
+                start = idx - length + 1
+                if start < first_start:
+                    first_start, first = start, value
+                if start > last_start:
+                    last_start, last = start, value
+
+        if first is None or last is None:
+            return None
+
+        return first, last
+
+
+def test_overlapping_matches() -> None:
+    automaton = Automaton({"one": 1, "eight": 8, "two": 2, "1": 1})
+    assert list(automaton.iter_matches("eightwone1")) == [(0, 8), (4, 2), (6, 1), (9, 1)]
+    assert automaton.first_and_last("xeightwox") == (8, 2)
+
+
+def test_nested_words() -> None:
+    automaton = Automaton({"he": "he", "she": "she", "hers": "hers"})
+    assert list(automaton.iter_matches("ushers")) == [
+        (1, "she"),
+        (2, "he"),
+        (2, "hers"),
+    ]
+
+
+def test_no_match() -> None:
+    assert Automaton({"one": 1}).first_and_last("abc") is None
@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+import argparse
+import contextlib
+import importlib
+import math
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Any, Callable, Sequence, TextIO
+
+import cache
+from generators import GENERATORS
+from loader import skip_without_numpy
+from runner import DAYS, ROOT, WRITERS, measure, prepare, takes_input
+
+
+# Input sizes per day, in the unit of the respective generator
+SIZES = {
+    "day01": [1_000, 10_000, 100_000],
+    "day02": [1_000, 10_000, 100_000],
+    "day03": [25, 50, 100],
+    "day04": [1_000, 10_000, 50_000],
+    "day05": [10, 100, 1_000],
+    "day06": [10, 100, 1_000],
+    "day07": [1_000, 10_000, 50_000],
+    "day08": [200, 1_000, 4_000],
+    "day09": [1_000, 10_000, 50_000],
+    "day10": [50, 100, 200],
+    "day11": [20, 50, 100],
+    "day12": [100, 1_000, 5_000],
+    "day13": [100, 1_000, 5_000],
+    "day14": [50, 100, 200],
+    "day15": [1_000, 10_000, 100_000],
+}
+
+# Cumulative cold-start import time allowed per day module, in seconds
+IMPORT_BUDGET = 0.1
+
+# Modules that only tests, profiling, caching or large inputs need. Importing
+# one of them from a solver is the kind of regression a wall-clock budget misses
+LAZY_IMPORTS = {"pytest", "numpy", "cProfile", "pickle", "hashlib"}
+
+
+@dataclass
+class BenchResult:
+    day: str
+    phase: str
+    size: int
+    wall_time: float
+    cpu_time: float
+    throughput: float
+    scaling: float | None = None
+
+
+def bench_day(
+    day: str, sizes: Sequence[int], repeat: int = 3, seed: int = 0
+) -> list[BenchResult]:
+    module = importlib.import_module(day)
+    phases = [phase for phase in ("part1", "part2") if hasattr(module, phase)]
+
+    results = []
+    for size in sizes:
+        inputs = GENERATORS[day](size, seed=seed)
+
+        timings = {}
+        for _ in range(repeat):
+            parsed, *parse_timing = measure(prepare, module, inputs)
+            timings["parse"] = min(timings.get("parse", parse_timing), parse_timing)
+
+            for phase in phases:
+                part = getattr(module, phase)
+                args = (parsed,) if takes_input(part) else ()
+                _, *timing = measure(part, *args)
+                timings[phase] = min(timings.get(phase, timing), timing)
+
+        for phase, (wall_time, cpu_time) in timings.items():
+            throughput = size / wall_time if wall_time > 0 else math.inf
+            results.append(
+                BenchResult(day, phase, size, wall_time, cpu_time, throughput)
+            )
+
+    add_scaling(results, len(timings))
+    return results
+
+
+def add_scaling(results: list[BenchResult], phases_per_size: int) -> None:
+    # Empirical exponent of the runtime between consecutive sizes
+    for prev, curr in zip(results, results[phases_per_size:]):
+        if prev.wall_time > 0 and curr.wall_time > 0:
+            curr.scaling = math.log(curr.wall_time / prev.wall_time) / math.log(
+                curr.size / prev.size
+            )
+
+
+def alternatives(day: str) -> dict[str, Callable[[str], Any]]:
+    # Competing implementations of the same step, run on identical inputs
+    module = importlib.import_module(day)
+
+    match day:
+        case "day02":
+            return {
+                "regex": lambda inputs: module.GameStore.from_games(
+                    module.iter_games(inputs)
+                ),
+                "tokenizer": module.parse,
+            }
+        case "day04":
+            return {
+                "sets": lambda inputs: module.part1(inputs, backend="python"),
+                "numpy": lambda inputs: module.part1(inputs, backend="numpy"),
+            }
+        case _:
+            return {}
+
+
+def bench_alternatives(
+    day: str, sizes: Sequence[int], repeat: int = 3, seed: int = 0
+) -> list[BenchResult]:
+    candidates = alternatives(day)
+
+    results = []
+    for size in sizes:
+        inputs = GENERATORS[day](size, seed=seed)
+
+        for name, func in candidates.items():
+            wall_time, cpu_time = min(
+                measure(func, inputs)[1:] for _ in range(repeat)
+            )
+            throughput = size / wall_time if wall_time > 0 else math.inf
+            results.append(
+                BenchResult(day, name, size, wall_time, cpu_time, throughput)
+            )
+
+    add_scaling(results, len(candidates))
+    return results
+
+
+@dataclass
+class ImportResult:
+    day: str
+    import_time: float
+    modules: list[str]
+
+
+def bench_import(day: str, repeat: int = 3) -> ImportResult:
+    import_time = math.inf
+    modules = []
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {day}"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        # Lines read "import time: <self us> | <cumulative us> | <package>"
+        modules = []
+        for line in proc.stderr.splitlines():
+            _, cumulative, package = line.split("|")
+            if not cumulative.strip().isdigit():
+                continue
+
+            package = package.strip()
+            modules.append(package)
+            if package == day:
+                import_time = min(import_time, int(cumulative) / 1e6)
+
+    return ImportResult(day, import_time, modules)
+
+
+def write_text(results: list[BenchResult], fout: TextIO) -> None:
+    for r in results:
+        scaling = f"n^{r.scaling:.2f}" if r.scaling is not None else ""
+        fout.write(
+            f"{r.day} {r.phase:<5} n={r.size:<8} {1e3 * r.wall_time:10.3f} ms wall "
+            f"{1e3 * r.cpu_time:10.3f} ms cpu {r.throughput:14.1f} n/s  {scaling}\n"
+        )
+
+
+def write_import_text(results: list[ImportResult], fout: TextIO) -> None:
+    for r in results:
+        status = "ok" if r.import_time <= IMPORT_BUDGET else "over budget"
+        fout.write(
+            f"{r.day} import {1e3 * r.import_time:10.3f} ms "
+            f"{len(r.modules):4} modules  {status}\n"
+        )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the daily solvers")
+    parser.add_argument("days", nargs="*", metavar="day")
+    parser.add_argument("--sizes", type=int, nargs="+")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--imports", action="store_true", help="benchmark cold-start import time"
+    )
+    parser.add_argument(
+        "--compare",
+        action="store_true",
+        help="benchmark alternative implementations against each other",
+    )
+    parser.add_argument("--format", choices=WRITERS, default="text")
+    parser.add_argument("--output", type=argparse.FileType("w"), default=sys.stdout)
+    args = parser.parse_args(argv)
+
+    unknown = [day for day in args.days if day not in DAYS]
+    if unknown:
+        parser.error(f"unknown days: {', '.join(unknown)}")
+
+    if args.imports:
+        import_results = [bench_import(day, args.repeat) for day in args.days or DAYS]
+        if args.format == "text":
+            write_import_text(import_results, args.output)
+        else:
+            WRITERS[args.format](import_results, args.output)
+        return
+
+    # Cache hits would be timed instead of the solvers
+    cache.configure(None)
+
+    writer = write_text if args.format == "text" else WRITERS[args.format]
+    bench = bench_alternatives if args.compare else bench_day
+
+    results = []
+    with contextlib.redirect_stdout(sys.stderr):
+        for day in args.days or DAYS:
+            sizes = args.sizes or SIZES[day]
+            results.extend(bench(day, sizes, repeat=args.repeat, seed=args.seed))
+
+    writer(results, args.output)
+
+
+def test_bench_day() -> None:
+    results = bench_day("day09", [10, 20], repeat=1)
+    assert [(r.phase, r.size) for r in results] == [
+        ("parse", 10),
+        ("part1", 10),
+        ("part2", 10),
+        ("parse", 20),
+        ("part1", 20),
+        ("part2", 20),
+    ]
+    assert all(r.scaling is None for r in results[:3])
+
+
+def test_bench_alternatives() -> None:
+    results = bench_alternatives("day02", [10, 20], repeat=1)
+    assert [(r.phase, r.size) for r in results] == [
+        ("regex", 10),
+        ("tokenizer", 10),
+        ("regex", 20),
+        ("tokenizer", 20),
+    ]
+
+
+def test_alternatives_agree() -> None:
+    skip_without_numpy()
+    for day in ("day02", "day04"):
+        inputs = GENERATORS[day](50)
+        results = [func(inputs) for func in alternatives(day).values()]
+        assert results[1:] == results[:-1], day
+
+
+def test_import_time() -> None:
+    # Timings depend on the machine and are only reported by `--imports`
+    for day in DAYS:
+        result = bench_import(day, repeat=1)
+        assert LAZY_IMPORTS.isdisjoint(result.modules), day
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+import functools
+import mmap
+import os
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, TypeVar
+
+
+CACHE_DIR_ENV = "AOC_CACHE_DIR"
+CACHE_MAX_BYTES_ENV = "AOC_CACHE_MAX_BYTES"
+DEFAULT_MAX_BYTES = 64 * 2**20
+
+# Cached results, and lookup tables that solvers persist next to them
+CACHE_SUFFIXES = (".pickle", ".table")
+
+# Allocated size of all entries, kept up to date by every write
+INDEX_NAME = "total-bytes"
+
+# A full cache is evicted down to this share of its limit, rather than just below
+# the limit, so that it is not scanned again on the next write
+EVICT_TO = 0.75
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# hashlib and pickle are imported where they are used: every solver imports this
+# module, and they are only needed once caching is configured
+
+# Read from the environment so that worker processes pick up the configuration
+_directory: Path | None = (
+    Path(os.environ[CACHE_DIR_ENV]) if os.environ.get(CACHE_DIR_ENV) else None
+)
+_max_bytes = int(os.environ.get(CACHE_MAX_BYTES_ENV, DEFAULT_MAX_BYTES))
+
+
+def configure(directory: Path | None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+    global _directory, _max_bytes
+
+    _directory = directory
+    _max_bytes = max_bytes
+
+    if directory is None:
+        os.environ.pop(CACHE_DIR_ENV, None)
+    else:
+        directory.mkdir(parents=True, exist_ok=True)
+        os.environ[CACHE_DIR_ENV] = str(directory)
+    os.environ[CACHE_MAX_BYTES_ENV] = str(max_bytes)
+
+
+def cache_directory() -> Path | None:
+    return _directory
+
+
+def cache_max_bytes() -> int:
+    return _max_bytes
+
+
+def local_dependencies(module_name: str) -> set[str]:
+    # The module and every module next to it that it imports, transitively, since
+    # solvers keep part of their logic in shared modules such as loader.py
+    directory = Path(sys.modules[module_name].__file__ or "").parent
+
+    found = set()
+    pending = [module_name]
+    while pending:
+        name = pending.pop()
+        module = sys.modules.get(name)
+        path = getattr(module, "__file__", None)
+        if name in found or path is None or Path(path).parent != directory:
+            continue
+
+        found.add(name)
+        for value in vars(module).values():
+            if isinstance(value, ModuleType):
+                pending.append(value.__name__)
+            elif isinstance(getattr(value, "__module__", None), str):
+                pending.append(value.__module__)
+
+    return found
+
+
+@functools.cache
+def source_digest(module_name: str) -> str:
+    import hashlib
+
+    h = hashlib.sha256()
+    for name in sorted(local_dependencies(module_name)):
+        h.update(f"{name}:".encode())
+        h.update(Path(sys.modules[name].__file__ or "").read_bytes())
+
+    return h.hexdigest()
+
+
+def input_digest(args: tuple[Any, ...], kwargs: dict[str, Any]) -> str | None:
+    import hashlib
+    import pickle
+
+    h = hashlib.sha256()
+    for arg in args + tuple(sorted(kwargs.items())):
+        match arg:
+            case str():
+                h.update(b"str:")
+                h.update(arg.encode())
+            case bytes() | bytearray() | memoryview() | mmap.mmap():
+                h.update(b"bytes:")
+                h.update(arg)
+            case _:
+                # Iterators and file objects cannot be pickled and are not cached
+                try:
+                    h.update(b"pickle:")
+                    h.update(pickle.dumps(arg))
+                except (TypeError, AttributeError, pickle.PicklingError):
+                    return None
+
+    return h.hexdigest()
+
+
+def allocated_bytes(stat: os.stat_result) -> int:
+    # Entries are a few bytes each, what they take on disk is whole blocks
+    blocks = getattr(stat, "st_blocks", None)
+    return stat.st_size if blocks is None else blocks * 512
+
+
+def write_total(directory: Path, total_bytes: int) -> None:
+    path = directory / INDEX_NAME
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_text(str(total_bytes))
+    os.replace(tmp_path, path)
+
+
+def evict(directory: Path, max_bytes: int) -> None:
+    entries = []
+    for path in directory.iterdir():
+        if path.suffix not in CACHE_SUFFIXES:
+            continue
+
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, allocated_bytes(stat), path))
+
+    # Hits touch their entry, so the oldest modification time is least recently used
+    total_bytes = sum(size for _, size, _ in entries)
+    if total_bytes > max_bytes:
+        for _, size, path in sorted(entries):
+            if total_bytes <= max_bytes * EVICT_TO:
+                break
+
+            path.unlink(missing_ok=True)
+            total_bytes -= size
+
+    write_total(directory, total_bytes)
+
+
+def track(path: Path, max_bytes: int) -> None:
+    # Adds a new entry to the running total and only scans the directory once the
+    # total exceeds the limit. Concurrent workers may lose each other's updates,
+    # every scan corrects the total
+    directory = path.parent
+    try:
+        total_bytes = int((directory / INDEX_NAME).read_text())
+        total_bytes += allocated_bytes(path.stat())
+    except (FileNotFoundError, ValueError):
+        total_bytes = None
+
+    if total_bytes is None or total_bytes > max_bytes:
+        evict(directory, max_bytes)
+    else:
+        write_total(directory, total_bytes)
+
+
+def cached(func: F) -> F:
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        directory = _directory
+        if directory is None:
+            return func(*args, **kwargs)
+
+        import hashlib
+        import pickle
+
+        digest = input_digest(args, kwargs)
+        if digest is None:
+            return func(*args, **kwargs)
+
+        key = hashlib.sha256(
+            f"{func.__module__}.{func.__qualname__}:"
+            f"{source_digest(func.__module__)}:{digest}".encode()
+        ).hexdigest()
+        path = directory / f"{key}.pickle"
+
+        try:
+            with open(path, "rb") as fin:
+                result = pickle.load(fin)
+            os.utime(path)
+            return result
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            pass
+
+        result = func(*args, **kwargs)
+
+        # Write atomically, concurrent workers may race on the same key
+        directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as fout:
+            pickle.dump(result, fout)
+        os.replace(tmp_path, path)
+        track(path, _max_bytes)
+
+        return result
+
+    return wrapper  # type: ignore[return-value]
+
+
+def test_cached(tmp_path: Path) -> None:
+    calls = []
+
+    @cached
+    def square(x: str) -> int:
+        calls.append(x)
+        return int(x) ** 2
+
+    try:
+        configure(tmp_path)
+        assert square("3") == 9
+        assert square("3") == 9
+        assert square(b"3") == 9
+        assert calls == ["3", b"3"]
+
+        configure(None)
+        assert square("3") == 9
+        assert calls == ["3", b"3", "3"]
+    finally:
+        configure(None)
+
+
+def test_cached_uncacheable_arguments(tmp_path: Path) -> None:
+    @cached
+    def total(numbers: Any) -> int:
+        return sum(numbers)
+
+    try:
+        configure(tmp_path)
+        assert total(x for x in range(4)) == 6
+        assert list(tmp_path.iterdir()) == []
+    finally:
+        configure(None)
+
+
+def test_local_dependencies() -> None:
+    import day01
+
+    assert local_dependencies(day01.__name__) == {"day01", "ahocorasick", "cache", "loader"}
+
+
+def test_evict(tmp_path: Path) -> None:
+    for i in range(4):
+        path = tmp_path / f"{i}.pickle"
+        path.write_bytes(b"x" * 10)
+        os.utime(path, (i, i))
+
+    (tmp_path / "4.table").write_bytes(b"x" * 10)
+    (tmp_path / "5.123.tmp").write_bytes(b"x" * 10)
+
+    # Limits count whole blocks, not the 10 bytes written
+    size = allocated_bytes((tmp_path / "4.table").stat())
+    evict(tmp_path, 3 * size)
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "3.pickle",
+        "4.table",
+        "5.123.tmp",
+        INDEX_NAME,
+    ]
+    assert (tmp_path / INDEX_NAME).read_text() == str(2 * size)
+
+
+def test_track(tmp_path: Path) -> None:
+    paths = [tmp_path / f"{i}.pickle" for i in range(4)]
+    for i, path in enumerate(paths):
+        path.write_bytes(b"x")
+        os.utime(path, (i, i))
+        size = allocated_bytes(path.stat())
+        if i == 1:
+            # Not counted, the directory is not scanned again until it is full
+            (tmp_path / "untracked.table").write_bytes(b"x")
+
+        track(path, 3 * size)
+        if i < 3:
+            assert (tmp_path / INDEX_NAME).read_text() == str((i + 1) * size)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "3.pickle",
+        INDEX_NAME,
+        "untracked.table",
+    ]
+    assert (tmp_path / INDEX_NAME).read_text() == str(2 * size)
@@ -1,45 +1,129 @@
 #!/usr/bin/env python
-def part1(inputs: str) -> int:
+from ahocorasick import Automaton
+from cache import cached
+from loader import (
+    NUMPY_MIN_BYTES,
+    Buffer,
+    Inputs,
+    choose_backend,
+    iter_lines,
+    skip_without_numpy,
+)
+
+
+def sum_calibration_values(inputs: str | Buffer) -> int:
+    import numpy as np
+
+    if isinstance(inputs, str):
+        inputs = inputs.encode()
+
+    chars = np.frombuffer(inputs, dtype=np.uint8)
+    if len(chars) == 0:
+        return 0
+
+    line_ends = np.flatnonzero(chars == ord("\n"))
+    if chars[-1] != ord("\n"):
+        line_ends = np.append(line_ends, len(chars))
+    line_begins = np.concatenate(([0], line_ends[:-1] + 1))
+
+    # Digits per line lie between the insertion points of the line boundaries
+    digit_positions = np.flatnonzero((chars >= ord("0")) & (chars <= ord("9")))
+    lo = np.searchsorted(digit_positions, line_begins)
+    hi = np.searchsorted(digit_positions, line_ends)
+    if np.any(hi <= lo):
+        raise ValueError("Line without digits")
+
+    first = chars[digit_positions[lo]].astype(np.int64) - ord("0")
+    last = chars[digit_positions[hi - 1]].astype(np.int64) - ord("0")
+
+    return int(10 * first.sum() + last.sum())
+
+
+@cached
+def part1(inputs: Inputs, backend: str = "auto") -> int:
+    # Streamed input is never sent to numpy
+    size = len(inputs) if isinstance(inputs, str | Buffer) else 0
+    backend = choose_backend(backend, size, NUMPY_MIN_BYTES)
+
+    if backend == "numpy":
+        assert isinstance(inputs, str | Buffer)
+        return sum_calibration_values(inputs)
+
     s = 0
-    for line in inputs.splitlines():
+    for line in iter_lines(inputs):
         digits = [char for char in line if char.isdigit()]
         s += int(digits[0] + digits[-1])
 
     return s
 
 
-def part2(inputs: str) -> int:
-    mapping = {
-        "one": "1",
-        "two": "2",
-        "three": "3",
-        "four": "4",
-        "five": "5",
-        "six": "6",
-        "seven": "7",
-        "eight": "8",
-        "nine": "9",
-    }
+DIGITS = {
+    "one": "1",
+    "two": "2",
+    "three": "3",
+    "four": "4",
+    "five": "5",
+    "six": "6",
+    "seven": "7",
+    "eight": "8",
+    "nine": "9",
+}
 
-    for num in range(1, 10):
-        mapping[str(num)] = str(num)
+for num in range(1, 10):
+    DIGITS[str(num)] = str(num)
 
-    s = 0
-    for line in inputs.splitlines():
-        forward_iter = ((line.find(key), mapping[key]) for key in mapping)
-        backward_iter = ((line.rfind(key), mapping[key]) for key in mapping)
+DIGITS_AUTOMATON = Automaton(DIGITS)
 
-        _, leftmost = min(filter(lambda x: x[0] >= 0, forward_iter))
-        _, rightmost = max(filter(lambda x: x[0] >= 0, backward_iter))
 
+@cached
+def part2(inputs: Inputs) -> int:
+    s = 0
+    for line in iter_lines(inputs):
+        # Single pass over the line, overlapping words such as "eightwo" included
+        match = DIGITS_AUTOMATON.first_and_last(line)
+        assert match is not None
+
+        leftmost, rightmost = match
         s += int(leftmost + rightmost)
 
     return s
 
 
-if __name__ == "__main__":
-    with open("inputs/day1.txt") as fin:
-        inputs = fin.read()
+TEST_INPUT_1 = """\
+1abc2
+pqr3stu8vwx
+a1b2c3d4e5f
+treb7uchet"""
+
+TEST_INPUT_2 = """\
+two1nine
+eightwothree
+abcone2threexyz
+xtwone3four
+4nineeightseven2
+zoneight234
+7pqrstsixteen"""
+
+
+def test_part1() -> None:
+    assert part1(TEST_INPUT_1) == 142
+
+
+def test_part1_numpy() -> None:
+    import pytest
+
+    skip_without_numpy()
+    assert part1(TEST_INPUT_1, backend="numpy") == 142
+    assert part1(TEST_INPUT_1.encode() + b"\n", backend="numpy") == 142
+    assert part1("", backend="numpy") == part1("", backend="python") == 0
+
+    with pytest.raises(ValueError):
+        part1("1\n\n2", backend="numpy")
+
+
+def test_part2() -> None:
+    assert part2(TEST_INPUT_2) == 281
+
 
-    print(f"Part 1: {part1(inputs)}")
-    print(f"Part 2: {part2(inputs)}")
+def test_part2_overlapping() -> None:
+    assert part2("xeightwo\noneight") == 82 + 18
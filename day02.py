@@ -1,6 +1,32 @@
 #!/usr/bin/env python
 import re
-from dataclasses import dataclass
+from array import array
+from dataclasses import dataclass, field
+from typing import Generator, Iterable, Iterator, Self, Sequence
+
+from cache import cached
+from loader import (
+    NUMPY_MIN_CELLS,
+    NUMPY_MIN_ITEMS,
+    Inputs,
+    iter_byte_lines,
+    iter_lines,
+    skip_without_numpy,
+    use_numpy,
+)
+from profiling import timed
+
+
+# Largest (thresholds x games) block evaluated at once
+NUMPY_BLOCK_CELLS = 1 << 22
+
+# Token kinds emitted by `tokenize`
+GAME = 0
+DRAW = 1
+CUBES = 2
+
+# Colours are told apart by their first letter
+COLOR_INDEX = {ord("r"): 0, ord("g"): 1, ord("b"): 2}
 
 
 @dataclass
@@ -9,12 +35,53 @@ class Game:
     draws: list[dict[str, int]]
 
 
-def parse(inputs: str) -> list[Game]:
+@dataclass
+class GameStore:
+    # Draws of game `i` are at `offsets[i]:offsets[i + 1]` of the colour columns,
+    # and the largest count of each colour in game `i` at `max_*[i]`
+    ids: array = field(default_factory=lambda: array("q"))
+    offsets: array = field(default_factory=lambda: array("q", [0]))
+    red: array = field(default_factory=lambda: array("q"))
+    green: array = field(default_factory=lambda: array("q"))
+    blue: array = field(default_factory=lambda: array("q"))
+    max_red: array = field(default_factory=lambda: array("q"))
+    max_green: array = field(default_factory=lambda: array("q"))
+    max_blue: array = field(default_factory=lambda: array("q"))
+
+    @classmethod
+    def from_games(cls, games: Iterable[Game]) -> Self:
+        store = cls()
+        for game in games:
+            store.ids.append(game.id)
+            for draw in game.draws:
+                store.red.append(draw.get("red", 0))
+                store.green.append(draw.get("green", 0))
+                store.blue.append(draw.get("blue", 0))
+
+            begin = store.offsets[-1]
+            store.offsets.append(len(store.red))
+            store.max_red.append(max(store.red[begin:], default=0))
+            store.max_green.append(max(store.green[begin:], default=0))
+            store.max_blue.append(max(store.blue[begin:], default=0))
+
+        return store
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def maxima(self) -> tuple[array, array, array]:
+        return self.max_red, self.max_green, self.max_blue
+
+    def powers(self) -> list[int]:
+        return [r * g * b for r, g, b in zip(*self.maxima())]
+
+
+@timed
+def iter_games(inputs: Inputs) -> Generator[Game, None, None]:
     pattern = re.compile(r"^Game (\d+): (.*)$")
     pattern_color = re.compile(r"(\d+) (red|green|blue)")
 
-    games = []
-    for line in inputs.splitlines():
+    for line in iter_lines(inputs):
         m = pattern.match(line)
         if m is None:
             continue
@@ -28,10 +95,52 @@ def parse(inputs: str) -> list[Game]:
             }
             draws.append(color_counts)
 
-        game = Game(int(game_id), draws)
-        games.append(game)
+        yield Game(int(game_id), draws)
+
+
+def tokenize(inputs: Inputs) -> Iterator[tuple[int, int, int]]:
+    # Yields (GAME, id, 0), (DRAW, 0, 0) and (CUBES, count, colour index)
+    for line in iter_byte_lines(inputs):
+        if not line.startswith(b"Game "):
+            continue
+
+        header, _, cubes = line.partition(b": ")
+        yield GAME, int(header[5:]), 0
+
+        for draw in cubes.split(b"; "):
+            yield DRAW, 0, 0
+
+            for item in draw.split(b", "):
+                count, _, color = item.partition(b" ")
+                if color:
+                    yield CUBES, int(count), COLOR_INDEX[color[0]]
+
+
+@timed
+def parse(inputs: Inputs) -> GameStore:
+    store = GameStore()
+    columns = (store.red, store.green, store.blue)
+    maxima = (store.max_red, store.max_green, store.max_blue)
+
+    for kind, value, color in tokenize(inputs):
+        if kind == CUBES:
+            columns[color][-1] = value
+            if value > maxima[color][-1]:
+                maxima[color][-1] = value
+        elif kind == DRAW:
+            for column in columns:
+                column.append(0)
+        else:
+            if store.ids:
+                store.offsets.append(len(store.red))
+            store.ids.append(value)
+            for column in maxima:
+                column.append(0)
 
-    return games
+    if store.ids:
+        store.offsets.append(len(store.red))
+
+    return store
 
 
 def possible_game(game: Game, red: int, green: int, blue: int) -> bool:
@@ -46,11 +155,57 @@ def possible_game(game: Game, red: int, green: int, blue: int) -> bool:
     return True
 
 
-def part1(games: list[Game]) -> int:
+def possible_id_sums(
+    games: GameStore, thresholds: Sequence[tuple[int, int, int]]
+) -> list[int]:
+    max_red, max_green, max_blue = games.maxima()
+
+    cells = len(games) * len(thresholds)
+    if use_numpy(cells, NUMPY_MIN_CELLS):
+        import numpy as np
+
+        maxima = np.stack(
+            [
+                np.frombuffer(column, dtype=np.int64)
+                for column in (max_red, max_green, max_blue)
+            ],
+            axis=1,
+        )
+        ids = np.frombuffer(games.ids, dtype=np.int64)
+        limits = np.asarray(thresholds, dtype=np.int64).reshape(-1, 3)
+
+        # (thresholds x games) feasibility matrix, evaluated in blocks
+        block = max(1, NUMPY_BLOCK_CELLS // max(1, len(games)))
+        sums = []
+        for begin in range(0, len(limits), block):
+            chunk = limits[begin : begin + block]
+            possible = np.all(maxima[None, :, :] <= chunk[:, None, :], axis=2)
+            sums.append(possible.astype(np.int64) @ ids)
+
+        return [int(s) for s in np.concatenate(sums)] if sums else []
+
+    maxima = list(zip(games.ids, max_red, max_green, max_blue))
+    return [
+        sum(
+            game_id
+            for game_id, r, g, b in maxima
+            if r <= red and g <= green and b <= blue
+        )
+        for red, green, blue in thresholds
+    ]
+
+
+@cached
+def part1(games: GameStore | Iterable[Game]) -> int:
     red = 12
     green = 13
     blue = 14
 
+    if isinstance(games, GameStore):
+        (s,) = possible_id_sums(games, [(red, green, blue)])
+        return s
+
+    # Streaming fallback for an iterable of games
     s = 0
     for game in games:
         if possible_game(game, red, green, blue):
@@ -59,7 +214,11 @@ def part1(games: list[Game]) -> int:
     return s
 
 
-def part2(games: list[Game]) -> int:
+@cached
+def part2(games: GameStore | Iterable[Game]) -> int:
+    if isinstance(games, GameStore):
+        return sum(games.powers())
+
     total_power = 0
     for game in games:
         max_red = max(draw.get("red", 0) for draw in game.draws)
@@ -71,10 +230,54 @@ def part2(games: list[Game]) -> int:
     return total_power
 
 
-if __name__ == "__main__":
-    with open("inputs/day02.txt") as fin:
-        inputs = fin.read()
+TEST_INPUT = """\
+Game 1: 3 blue, 4 red; 1 red, 2 green, 6 blue; 2 green
+Game 2: 1 blue, 2 green; 3 green, 4 blue, 1 red; 1 green, 1 blue
+Game 3: 8 green, 6 blue, 20 red; 5 blue, 4 red, 13 green; 5 green, 1 red
+Game 4: 1 green, 3 red, 6 blue; 3 green, 6 red; 3 green, 15 blue, 14 red
+Game 5: 6 red, 1 blue, 3 green; 2 blue, 1 red, 2 green"""
+
+
+def test_part1() -> None:
+    assert part1(parse(TEST_INPUT)) == 8
+    assert part1(iter_games(TEST_INPUT)) == 8
+
+
+def test_part2() -> None:
+    assert part2(parse(TEST_INPUT)) == 2286
+    assert part2(iter_games(TEST_INPUT)) == 2286
+
+
+def test_parse() -> None:
+    assert parse(TEST_INPUT) == GameStore.from_games(iter_games(TEST_INPUT))
+    assert parse(TEST_INPUT.encode()) == GameStore.from_games(iter_games(TEST_INPUT))
+    assert len(parse("")) == 0
+
+
+def test_maxima() -> None:
+    games = parse(TEST_INPUT)
+    assert games.maxima() == (
+        array("q", [4, 1, 20, 14, 6]),
+        array("q", [2, 3, 13, 3, 3]),
+        array("q", [6, 4, 6, 15, 2]),
+    )
+    assert games.powers() == [48, 12, 1560, 630, 36]
+
+
+def test_possible_id_sums() -> None:
+    games = parse(TEST_INPUT)
+    thresholds = [(12, 13, 14), (0, 0, 0), (20, 13, 15), (100, 100, 100)]
+    assert possible_id_sums(games, thresholds) == [8, 0, 15, 15]
+
+
+def test_possible_id_sums_numpy() -> None:
+    skip_without_numpy()
+    games = parse(TEST_INPUT)
+    thresholds = [(r, g, b) for r in range(21) for g in range(14) for b in range(16)]
+    expected = possible_id_sums(games, thresholds)
 
-    games = parse(inputs)
-    print(f"Part 1: {part1(games)}")
-    print(f"Part 2: {part2(games)}")
+    games = parse("\n".join([TEST_INPUT] * (NUMPY_MIN_ITEMS // 5)))
+    assert len(games) >= NUMPY_MIN_ITEMS
+    assert possible_id_sums(games, thresholds) == [
+        s * (NUMPY_MIN_ITEMS // 5) for s in expected
+    ]
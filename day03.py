@@ -2,6 +2,16 @@
 from dataclasses import dataclass
 from typing import Generator
 
+from cache import cached
+from loader import (
+    NUMPY_MIN_CELLS,
+    Inputs,
+    choose_backend,
+    iter_lines,
+    skip_without_numpy,
+)
+from profiling import timed
+
 
 @dataclass
 class Number:
@@ -21,6 +31,7 @@ class Number:
         return False
 
 
+@timed
 def find_numbers(lines: list[str]) -> Generator[Number, None, None]:
     for line_num, line in enumerate(lines):
         begin = None
@@ -38,6 +49,10 @@ def find_numbers(lines: list[str]) -> Generator[Number, None, None]:
             yield Number(line_number=line_num, span=(begin, len(line)))
 
 
+def is_symbol(c: str) -> bool:
+    return not c.isdigit() and c != "."
+
+
 def has_adjacent_symbol(number: Number, lines: list[str]) -> bool:
     line_num = number.line_number
     line_len = len(lines[line_num])
@@ -47,9 +62,6 @@ def has_adjacent_symbol(number: Number, lines: list[str]) -> bool:
     rightmost_adjacent = min(line_len - 1, end)
     sl = slice(leftmost_adjacent, rightmost_adjacent + 1)
 
-    def is_symbol(c: str) -> bool:
-        return not c.isdigit() and c != "."
-
     # Current line
     if is_symbol(lines[line_num][leftmost_adjacent]) or is_symbol(
         lines[line_num][rightmost_adjacent]
@@ -67,7 +79,53 @@ def has_adjacent_symbol(number: Number, lines: list[str]) -> bool:
     return False
 
 
-def part1(lines: list[str]) -> int:
+def part_number_sum(lines: list[str]) -> int:
+    import numpy as np
+
+    width = max((len(line) for line in lines), default=0)
+    text = "".join(line.ljust(width, ".") for line in lines).encode()
+    grid = np.frombuffer(text, dtype=np.uint8).reshape(len(lines), width)
+
+    is_digit = (grid >= ord("0")) & (grid <= ord("9"))
+    is_symbol = ~is_digit & (grid != ord("."))
+
+    # 3x3 dilation of the symbols by OR-ing the shifted, padded mask
+    padded = np.pad(is_symbol, 1)
+    adjacent = np.zeros_like(is_symbol)
+    for dx in range(3):
+        for dy in range(3):
+            adjacent |= padded[dx : dx + len(lines), dy : dy + width]
+
+    # A trailing non-digit column keeps numbers from running across rows
+    digits = np.pad(is_digit, ((0, 0), (0, 1))).ravel()
+    if not digits.any():
+        return 0
+
+    starts = digits & ~np.concatenate(([False], digits[:-1]))
+    run_ids = (np.cumsum(starts) - 1)[digits]
+    run_begins = np.flatnonzero(np.diff(run_ids, prepend=-1))
+    run_lengths = np.diff(np.append(run_begins, len(run_ids)))
+
+    # Place value of every digit within its number
+    offsets = np.arange(len(run_ids)) - run_begins[run_ids]
+    powers = run_lengths[run_ids] - offsets - 1
+    digit_values = np.pad(grid, ((0, 0), (0, 1))).ravel()[digits].astype(np.int64)
+    values = np.add.reduceat((digit_values - ord("0")) * 10**powers, run_begins)
+
+    touched = np.pad(adjacent, ((0, 0), (0, 1))).ravel()[digits]
+    is_part = np.logical_or.reduceat(touched, run_begins)
+
+    return int(values[is_part].sum())
+
+
+@cached
+def part1(lines: list[str], backend: str = "auto") -> int:
+    cells = sum(len(line) for line in lines)
+    backend = choose_backend(backend, cells, NUMPY_MIN_CELLS)
+
+    if backend == "numpy":
+        return part_number_sum(lines)
+
     s = 0
     for number in find_numbers(lines):
         if has_adjacent_symbol(number, lines):
@@ -85,28 +143,129 @@ def find_gear_candidates(lines: list[str]) -> Generator[tuple[int, int], None, N
                 yield (line_num, char_num)
 
 
+def label_numbers(lines: list[str]) -> tuple[list[int], dict[tuple[int, int], int]]:
+    # Values of all numbers, and the index of the number covering each digit cell
+    values = []
+    labels = {}
+    for number in find_numbers(lines):
+        label = len(values)
+        values.append(int(lines[number.line_number][slice(*number.span)]))
+        for char_num in range(*number.span):
+            labels[number.line_number, char_num] = label
+
+    return values, labels
+
+
+@cached
 def part2(lines: list[str]) -> int:
+    values, labels = label_numbers(lines)
+
     s = 0
     for gear_line_num, gear_char_num in find_gear_candidates(lines):
-        num_count = 0
-        num_prod = 1
-        for number in find_numbers(lines):
-            if not number.is_adjacent(gear_line_num, gear_char_num):
-                continue
-
-            num_count += 1
-            num_prod *= int(lines[number.line_number][slice(*number.span)])
+        adjacent = {
+            labels[x, y]
+            for x in range(gear_line_num - 1, gear_line_num + 2)
+            for y in range(gear_char_num - 1, gear_char_num + 2)
+            if (x, y) in labels
+        }
 
-        if num_count == 2:
-            s += num_prod
+        if len(adjacent) == 2:
+            first, second = adjacent
+            s += values[first] * values[second]
 
     return s
 
 
-if __name__ == "__main__":
-    with open("inputs/day03.txt") as fin:
-        inputs = fin.read()
+Row = tuple[str, list[tuple[int, int, int]]]
+
+
+def finish_row(
+    above: Row | None, row: Row, below: Row | None
+) -> Generator[tuple[str, int], None, None]:
+    line, numbers = row
+    window = [r for r in (above, row, below) if r is not None]
+
+    for begin, end, value in numbers:
+        sl = slice(max(0, begin - 1), end + 1)
+        if any(is_symbol(c) for neighbour, _ in window for c in neighbour[sl]):
+            yield "part", value
+
+    for char_num, char in enumerate(line):
+        if char != "*":
+            continue
+
+        adjacent = [
+            value
+            for _, neighbour_numbers in window
+            for begin, end, value in neighbour_numbers
+            if begin - 1 <= char_num <= end
+        ]
+        if len(adjacent) == 2:
+            yield "gear", adjacent[0] * adjacent[1]
+
+
+def scan(inputs: Inputs) -> Generator[tuple[str, int], None, None]:
+    # A row is finished as soon as the row below it arrives, so at most three
+    # rows are held at any time
+    above: Row | None = None
+    row: Row | None = None
+    for line in iter_lines(inputs):
+        numbers = [
+            (*number.span, int(line[slice(*number.span)]))
+            for number in find_numbers([line])
+        ]
+        below = (line, numbers)
+
+        if row is not None:
+            yield from finish_row(above, row, below)
+        above, row = row, below
+
+    if row is not None:
+        yield from finish_row(above, row, None)
+
+
+TEST_INPUT = """\
+467..114..
+...*......
+..35..633.
+......#...
+617*......
+.....+.58.
+..592.....
+......755.
+...$.*....
+.664.598.."""
+
+
+def test_part1() -> None:
+    assert part1(TEST_INPUT.splitlines()) == 4361
+
+
+def test_part1_numpy() -> None:
+    skip_without_numpy()
+    assert part1(TEST_INPUT.splitlines(), backend="numpy") == 4361
+    assert part1(["12*34", "....."], backend="numpy") == 46
+    assert part1(["1.", ".#", "99"], backend="numpy") == 100
+    assert part1(["..."], backend="numpy") == 0
+
+
+def test_part2() -> None:
+    assert part2(TEST_INPUT.splitlines()) == 467835
+
+
+def test_scan() -> None:
+    parts = [value for kind, value in scan(TEST_INPUT) if kind == "part"]
+    gears = [value for kind, value in scan(TEST_INPUT) if kind == "gear"]
+    assert sum(parts) == 4361
+    assert sum(gears) == 467835
+
+
+def test_scan_window_edges() -> None:
+    assert list(scan("12*34\n.....")) == [("part", 12), ("part", 34), ("gear", 408)]
+    assert list(scan("..7\n..*")) == [("part", 7)]
+    assert list(scan("5")) == []
+
 
-    lines = inputs.splitlines()
-    print(f"Part 1: {part1(lines)}")
-    print(f"Part 2: {part2(lines)}")
+def test_part2_shared_row() -> None:
+    assert part2(["12*34", "....."]) == 408
+    assert part2(["1.1", ".*.", "1.1"]) == 0
@@ -1,6 +1,21 @@
 import re
 from dataclasses import dataclass
-from typing import Generator
+from typing import Generator, Iterable
+
+from cache import cached
+from loader import (
+    Buffer,
+    Inputs,
+    choose_backend,
+    iter_lines,
+    skip_without_numpy,
+)
+from profiling import timed
+
+
+# Whole decks of more than a handful of cards are faster in numpy, see `python
+# bench.py day04 --compare`
+NUMPY_MIN_DECK_BYTES = 1 << 12
 
 
 @dataclass
@@ -9,9 +24,10 @@ class Card:
     num_matches: int
 
 
-def parse_cards(inputs: str) -> Generator[Card, None, None]:
+@timed
+def parse_cards(inputs: Inputs) -> Generator[Card, None, None]:
     pattern = re.compile(r"^Card\s+(\d+):\s+(.+)\s\|\s(.+)$")
-    for line in inputs.splitlines():
+    for line in iter_lines(inputs):
         m = pattern.match(line)
         if m is None:
             continue
@@ -24,27 +40,114 @@ def parse_cards(inputs: str) -> Generator[Card, None, None]:
         yield Card(card_num, num_matches)
 
 
-def part1(inputs: str) -> int:
+@timed
+def deck_matches(inputs: str | Buffer) -> list[int] | None:
+    # Whole deck at once for the usual layout, in which every line has its numbers
+    # right-aligned in the same three-character columns after the colon. Returns
+    # None for any other layout
+    import numpy as np
+
+    if isinstance(inputs, str):
+        inputs = inputs.encode()
+
+    text = bytes(inputs).rstrip(b"\n")
+    if not text:
+        return []
+
+    chars = np.frombuffer(text + b"\n", dtype=np.uint8)
+    colons = np.flatnonzero(chars == ord(":"))
+    ends = np.flatnonzero(chars == ord("\n"))
+    if len(colons) != len(ends) or np.any(ends - colons != ends[0] - colons[0]):
+        return None
+
+    # One row per card, from its colon up to the end of the line
+    width = int(ends[0] - colons[0])
+    rows = chars[colons[:, None] + np.arange(width)]
+
+    bar = int(np.argmax(rows[0] == ord("|")))
+    if (
+        np.any(rows[:, bar] != ord("|"))
+        or bar % 3 != 2
+        or (width - 1 - bar) % 3 != 0
+    ):
+        return None
+
+    # The two characters after each separating space
+    winning_columns = np.arange(2, bar, 3)
+    held_columns = np.arange(bar + 2, width, 3)
+    spaces = np.concatenate([winning_columns - 1, [bar - 1], held_columns - 1])
+    if np.any(rows[:, spaces] != ord(" ")):
+        return None
+
+    def numbers(columns: "np.ndarray") -> "np.ndarray | None":
+        tens = rows[:, columns]
+        ones = rows[:, columns + 1]
+        if np.any((ones < ord("0")) | (ones > ord("9"))) or np.any(
+            (tens != ord(" ")) & ((tens < ord("0")) | (tens > ord("9")))
+        ):
+            return None
+
+        tens = np.where(tens == ord(" "), ord("0"), tens).astype(np.intp)
+        return 10 * (tens - ord("0")) + ones.astype(np.intp) - ord("0")
+
+    winning = numbers(winning_columns)
+    held = numbers(held_columns)
+    if winning is None or held is None:
+        return None
+
+    # One row of 100 flags per card, looked up at the held numbers
+    cards = np.arange(len(rows))[:, None]
+    is_winning = np.zeros((len(rows), 100), dtype=bool)
+    is_winning[cards, winning] = True
+    matches = is_winning[cards, held].sum(axis=1)
+
+    return matches.tolist()
+
+
+def num_matches(inputs: Inputs, backend: str = "auto") -> list[int]:
+    size = len(inputs) if isinstance(inputs, str | Buffer) else 0
+    if choose_backend(backend, size, NUMPY_MIN_DECK_BYTES) == "numpy":
+        assert isinstance(inputs, str | Buffer)
+        matches = deck_matches(inputs)
+        if matches is not None:
+            return matches
+
+    return [card.num_matches for card in parse_cards(inputs)]
+
+
+@cached
+def part1(inputs: Inputs, backend: str = "auto") -> int:
     total_points = 0
-    for card in parse_cards(inputs):
-        if card.num_matches > 0:
-            total_points += 2 ** (card.num_matches - 1)
+    for matches in num_matches(inputs, backend):
+        if matches > 0:
+            total_points += 2 ** (matches - 1)
 
     return total_points
 
 
-def part2(inputs: str) -> int:
-    original_cards = list(parse_cards(inputs))
+def copy_counts(matches_per_card: Iterable[int]) -> list[int]:
+    num_matches = list(matches_per_card)
+
+    # Every copy of card `i` adds one copy to each of the following `num_matches`
+    # cards, recorded as +/- entries of a difference array that is summed up as we go
+    counts = []
+    delta = [0] * (len(num_matches) + 1)
+    extra = 0
+    for i, matches in enumerate(num_matches):
+        extra += delta[i]
+        count = 1 + extra
+        counts.append(count)
 
-    total_cards = len(original_cards)
-    stack = original_cards.copy()
-    while len(stack) > 0:
-        card = stack.pop()
-        for i in range(card.card_num + 1, card.card_num + card.num_matches + 1):
-            stack.append(original_cards[i - 1])
-            total_cards += 1
+        if matches > 0:
+            delta[i + 1] += count
+            delta[min(i + matches + 1, len(num_matches))] -= count
 
-    return total_cards
+    return counts
+
+
+@cached
+def part2(inputs: Inputs, backend: str = "auto") -> int:
+    return sum(copy_counts(num_matches(inputs, backend)))
 
 
 TEST_INPUT = """\
@@ -64,9 +167,33 @@ def test_part2() -> None:
     assert part2(TEST_INPUT) == 30
 
 
-if __name__ == "__main__":
-    with open("inputs/day04.txt") as fin:
-        inputs = fin.read()
+def test_copy_counts() -> None:
+    assert copy_counts(num_matches(TEST_INPUT)) == [1, 2, 4, 8, 14, 1]
+
+
+def test_copy_counts_exponential() -> None:
+    assert sum(copy_counts(range(99, -1, -1))) == 2**100 - 1
+
+
+def test_deck_matches() -> None:
+    skip_without_numpy()
+    expected = [card.num_matches for card in parse_cards(TEST_INPUT)]
+    assert deck_matches(TEST_INPUT) == expected
+    assert deck_matches(TEST_INPUT.encode() + b"\n") == expected
+    assert deck_matches("") == []
+    assert part1(TEST_INPUT, backend="numpy") == 13
+    assert part2(TEST_INPUT, backend="numpy") == 30
+
+    # Card numbers may differ in width, numbers may not
+    deck = "Card 9:  1 |  1  2\nCard 10:  3 |  4  3"
+    assert deck_matches(deck) == [1, 1]
+    assert deck_matches(deck.replace("|  4", "| 4")) is None
+
+    # Not fixed width, left to the per-card path
+    assert deck_matches("Card 1: 1 2 | 1 3\nCard 2: 10 2 | 10 2") is None
+    assert part2("Card 1: 1 2 | 1 3\nCard 2: 10 2 | 10 2", backend="numpy") == 3
+
 
-    print(f"Part 1: {part1(inputs)}")
-    print(f"Part 2: {part2(inputs)}")
+def test_part1_streaming() -> None:
+    lines = (line + "\n" for line in TEST_INPUT.splitlines())
+    assert part1(lines) == 13
@@ -1,6 +1,16 @@
 import re
+from bisect import bisect_right
 from dataclasses import dataclass
 from collections import defaultdict
+from typing import Self, Sequence
+
+from cache import cached
+from loader import NUMPY_MIN_ITEMS, skip_without_numpy, use_numpy
+from profiling import timed
+
+
+# End of the last segment of a composed almanac, above any almanac number
+UNBOUNDED = 1 << 63
 
 
 @dataclass
@@ -16,6 +26,7 @@ class MapEntry:
         )
 
 
+@timed
 def parse_seeds(inputs: str) -> list[int]:
     pattern_seeds = re.compile(r"^seeds: (.*)$", re.MULTILINE)
     m = pattern_seeds.search(inputs)
@@ -25,6 +36,7 @@ def parse_seeds(inputs: str) -> list[int]:
     return seeds
 
 
+@timed
 def parse_maps(inputs: str) -> defaultdict[tuple[str, str], MapEntry]:
     pattern_map = re.compile(r"^(\w+)-to-(\w+) map:$")
     pattern_map_entry = re.compile(r"^(\d+) (\d+) (\d+)$")
@@ -46,41 +58,226 @@ def parse_maps(inputs: str) -> defaultdict[tuple[str, str], MapEntry]:
     return maps
 
 
-def part1(inputs: str) -> int:
-    seeds = parse_seeds(inputs)
-    maps = parse_maps(inputs)
+@dataclass
+class Stage:
+    # Entries sorted by source range, as columns so the first overlapping entry
+    # can be found with a bisect
+    starts: list[int]
+    ends: list[int]
+    shifts: list[int]
+
+    @classmethod
+    def from_entries(cls, entries: list[MapEntry]) -> Self:
+        stage = cls([], [], [])
+        for entry in sorted(entries, key=lambda entry: entry.source_range_start):
+            stage.starts.append(entry.source_range_start)
+            stage.ends.append(entry.source_range_start + entry.range_length)
+            shift = entry.destination_range_start - entry.source_range_start
+            stage.shifts.append(shift)
+
+        return stage
+
+    def lookup(self, num: int) -> int:
+        i = bisect_right(self.starts, num) - 1
+        if i >= 0 and num < self.ends[i]:
+            return num + self.shifts[i]
+
+        return num
+
+
+def stages(maps: defaultdict[tuple[str, str], list[MapEntry]]) -> list[Stage]:
+    # Every stage, in order from seed to location
+    destinations = dict(maps.keys())
+
+    chain = []
+    state = "seed"
+    while state != "location":
+        destination = destinations[state]
+        chain.append(Stage.from_entries(maps[state, destination]))
+        state = destination
+
+    return chain
+
+
+def split_interval(begin: int, end: int, stage: Stage) -> list[tuple[int, int, int]]:
+    # Cuts the half-open interval (begin, end) at the entry boundaries into
+    # (begin, end, shift) pieces; numbers outside every entry map to themselves
+    starts, ends, shifts = stage.starts, stage.ends, stage.shifts
+
+    pieces = []
+    i = max(0, bisect_right(starts, begin) - 1)
+    while i < len(starts) and starts[i] < end:
+        if begin < starts[i]:
+            pieces.append((begin, starts[i], 0))
+            begin = starts[i]
+        if begin < min(end, ends[i]):
+            pieces.append((begin, min(end, ends[i]), shifts[i]))
+            begin = ends[i]
+        i += 1
+
+    if begin < end:
+        pieces.append((begin, end, 0))
+    return pieces
+
+
+def map_intervals(
+    intervals: list[tuple[int, int]], stage: Stage
+) -> list[tuple[int, int]]:
+    return [
+        (piece_begin + shift, piece_end + shift)
+        for begin, end in intervals
+        for piece_begin, piece_end, shift in split_interval(begin, end, stage)
+    ]
+
+
+@dataclass
+class Almanac:
+    # Seeds from `breakpoints[i]` up to the next breakpoint map to seed + `offsets[i]`
+    breakpoints: list[int]
+    offsets: list[int]
+
+    @classmethod
+    def compose(cls, chain: list[Stage]) -> Self:
+        # Segments of seed numbers that stay contiguous through every stage so far,
+        # with their accumulated offset
+        segments = [(0, UNBOUNDED, 0)]
+        for stage in chain:
+            segments = [
+                (piece_begin - offset, piece_end - offset, offset + shift)
+                for begin, end, offset in segments
+                for piece_begin, piece_end, shift in split_interval(
+                    begin + offset, end + offset, stage
+                )
+            ]
+        segments.sort()
+
+        breakpoints: list[int] = []
+        offsets: list[int] = []
+        for begin, _, offset in segments:
+            if not offsets or offsets[-1] != offset:
+                breakpoints.append(begin)
+                offsets.append(offset)
+
+        return cls(breakpoints, offsets)
 
-    locations = []
-    for seed in seeds:
-        state = "seed"
-        num = seed
-        while state != "location":
-            (destination,) = [key[1] for key in maps if key[0] == state]
-            entries = maps[state, destination]
+    def lookup(self, seed: int) -> int:
+        return seed + self.offsets[bisect_right(self.breakpoints, seed) - 1]
 
-            for entry in entries:
-                if entry.contains(num):
-                    num = num - entry.source_range_start + entry.destination_range_start
-                    break
+    def lookup_many(self, seeds: Sequence[int]) -> list[int]:
+        if use_numpy(len(seeds)):
+            import numpy as np
 
-            state = destination
+            values = np.asarray(seeds, dtype=np.int64)
+            idx = np.searchsorted(self.breakpoints, values, side="right") - 1
+            return (values + np.asarray(self.offsets, dtype=np.int64)[idx]).tolist()
 
-        locations.append(num)
+        return [self.lookup(seed) for seed in seeds]
+
+
+@cached
+def part1(inputs: str) -> int:
+    seeds = parse_seeds(inputs)
+    chain = stages(parse_maps(inputs))
+
+    # Composing costs about as much as looking up one seed per map entry
+    if len(seeds) >= sum(len(stage.starts) for stage in chain):
+        return min(Almanac.compose(chain).lookup_many(seeds))
+
+    locations = seeds
+    for stage in chain:
+        locations = [stage.lookup(num) for num in locations]
 
     return min(locations)
 
 
-def part2(inputs: str) -> None:
+@cached
+def part2(inputs: str) -> int:
     seeds = parse_seeds(inputs)
     maps = parse_maps(inputs)
 
     seed_range_start = seeds[::2]
     seed_range_length = seeds[1::2]
 
+    intervals = [
+        (start, start + length)
+        for start, length in zip(seed_range_start, seed_range_length)
+    ]
+    for stage in stages(maps):
+        intervals = map_intervals(intervals, stage)
+
+    return min(begin for begin, _ in intervals)
+
+
+TEST_INPUT = """\
+seeds: 79 14 55 13
+
+seed-to-soil map:
+50 98 2
+52 50 48
+
+soil-to-fertilizer map:
+0 15 37
+37 52 2
+39 0 15
+
+fertilizer-to-water map:
+49 53 8
+0 11 42
+42 0 7
+57 7 4
+
+water-to-light map:
+88 18 7
+18 25 70
+
+light-to-temperature map:
+45 77 23
+81 45 19
+68 64 13
+
+temperature-to-humidity map:
+0 69 1
+1 0 69
+
+humidity-to-location map:
+60 56 37
+56 93 4"""
+
+
+def test_part1() -> None:
+    assert part1(TEST_INPUT) == 35
+
+    # Enough seeds to go through the composed almanac
+    seeds = " ".join(str(seed) for seed in range(0, 100, 3))
+    assert part1(TEST_INPUT.replace("79 14 55 13", seeds)) == 2
+
+
+def test_part2() -> None:
+    assert part2(TEST_INPUT) == 46
+
+
+def test_map_intervals() -> None:
+    stage = Stage.from_entries([MapEntry(100, 10, 5)])
+    assert map_intervals([(0, 20)], stage) == [(0, 10), (100, 105), (15, 20)]
+    assert map_intervals([(11, 13)], stage) == [(101, 103)]
+    assert map_intervals([(20, 30)], stage) == [(20, 30)]
+
+
+def test_split_interval() -> None:
+    stage = Stage.from_entries([MapEntry(0, 30, 10), MapEntry(100, 10, 5)])
+    assert split_interval(12, 35, stage) == [(12, 15, 90), (15, 30, 0), (30, 35, -30)]
+    assert split_interval(0, 5, stage) == [(0, 5, 0)]
+    assert split_interval(50, 60, stage) == [(50, 60, 0)]
+
+
+def test_almanac() -> None:
+    almanac = Almanac.compose(stages(parse_maps(TEST_INPUT)))
+    assert [almanac.lookup(seed) for seed in (79, 14, 55, 13)] == [82, 43, 86, 35]
+    assert almanac.lookup(0) == 22 and almanac.breakpoints[0] == 0
 
-if __name__ == "__main__":
-    with open("inputs/day05.txt") as fin:
-        inputs = fin.read()
 
-    print(f"Part 1: {part1(inputs)}")
-    print(f"Part 2: {part2(inputs)}")
+def test_almanac_numpy() -> None:
+    skip_without_numpy()
+    almanac = Almanac.compose(stages(parse_maps(TEST_INPUT)))
+    seeds = list(range(NUMPY_MIN_ITEMS))
+    assert almanac.lookup_many(seeds) == [almanac.lookup(seed) for seed in seeds]
@@ -1,40 +1,128 @@
 #!/usr/bin/env python
 import math
+from typing import Sequence
 
+from cache import cached
+from loader import NUMPY_MIN_ITEMS, Inputs, iter_lines, skip_without_numpy, use_numpy
+from profiling import timed
 
-def part1() -> int:
-    time = [57, 72, 69, 92]
-    distance = [291, 1172, 1176, 2026]
 
-    prod_of_ways_to_win = 1
-    for available_time, distance_record in zip(time, distance):
-        num_ways_to_win = 0
-        for hold_time in range(1, available_time):
-            velocity = hold_time
-            dist = velocity * (available_time - hold_time)
+# Larger times or distances overflow int64 or lose precision in a float64 square
+# root, such races take the exact path
+NUMPY_MAX_TIME = 1 << 26
+NUMPY_MAX_DISTANCE = 1 << 52
 
-            if dist > distance_record:
-                num_ways_to_win += 1
 
-        prod_of_ways_to_win *= num_ways_to_win
+@timed
+def parse_races(inputs: Inputs, kerning: bool = False) -> list[tuple[int, int]]:
+    # With bad kerning all numbers on a line are the digits of a single race
+    rows = {}
+    for line in iter_lines(inputs):
+        label, _, values = line.partition(":")
+        fields = values.split()
+        rows[label.strip()] = ["".join(fields)] if kerning else fields
 
-    return prod_of_ways_to_win
+    return list(zip(map(int, rows["Time"]), map(int, rows["Distance"])))
 
 
-def part2() -> int:
-    time = int("".join(map(str, [57, 72, 69, 92])))
-    distance = int("".join(map(str, [291, 1172, 1176, 2026])))
+def ways_to_win(time: int, distance: int) -> int:
+    # Holding for `h` wins when h * (time - h) > distance, i.e. strictly between the
+    # roots of h^2 - time * h + distance. Starting just below the lower root, the
+    # first winning hold time is at most a few steps away and the winning range is
+    # symmetric around time / 2
+    discriminant = time * time - 4 * distance
+    if discriminant < 0:
+        return 0
 
-    p = -time
-    q = distance
+    hold = (time - math.isqrt(discriminant) - 1) // 2
+    while hold <= time - hold and hold * (time - hold) <= distance:
+        hold += 1
 
-    x1 = -p / 2 + math.sqrt((p / 2) ** 2 - q)
-    x2 = -p / 2 - math.sqrt((p / 2) ** 2 - q)
+    return max(0, time - 2 * hold + 1)
 
-    num_ways = math.floor(x1) - math.ceil(x2) + 1
-    return num_ways
 
+def ways_to_win_many(races: Sequence[tuple[int, int]]) -> list[int]:
+    if (
+        use_numpy(len(races))
+        and max(time for time, _ in races) < NUMPY_MAX_TIME
+        and max(distance for _, distance in races) < NUMPY_MAX_DISTANCE
+    ):
+        import numpy as np
 
-if __name__ == "__main__":
-    print(f"Part 1: {part1()}")
-    print(f"Part 2: {part2()}")
+        time, distance = np.asarray(races, dtype=np.int64).T
+        discriminant = time * time - 4 * distance
+
+        # Float square root, corrected to the exact integer square root
+        root = np.sqrt(np.maximum(discriminant, 0)).astype(np.int64)
+        root -= root * root > discriminant
+        root += (root + 1) * (root + 1) <= discriminant
+
+        hold = (time - root - 1) // 2
+        for _ in range(3):
+            hold += (hold <= time - hold) & (hold * (time - hold) <= distance)
+
+        ways = np.maximum(0, time - 2 * hold + 1)
+        ways[discriminant < 0] = 0
+        return ways.tolist()
+
+    return [ways_to_win(time, distance) for time, distance in races]
+
+
+@cached
+def part1(inputs: Inputs) -> int:
+    return math.prod(ways_to_win_many(parse_races(inputs)))
+
+
+@cached
+def part2(inputs: Inputs) -> int:
+    ((time, distance),) = parse_races(inputs, kerning=True)
+    return ways_to_win(time, distance)
+
+
+TEST_INPUT = """\
+Time:      7  15   30
+Distance:  9  40  200"""
+
+
+def test_part1() -> None:
+    assert part1(TEST_INPUT) == 288
+    assert part1("Time: 57 72 69 92\nDistance: 291 1172 1176 2026") == 160816
+
+
+def test_part2() -> None:
+    assert part2(TEST_INPUT) == 71503
+    assert part2("Time: 57 72 69 92\nDistance: 291 1172 1176 2026") == 46561107
+
+
+def test_ways_to_win() -> None:
+    for time in range(30):
+        for distance in range(time * time // 4 + 2):
+            expected = sum(h * (time - h) > distance for h in range(time + 1))
+            assert ways_to_win(time, distance) == expected
+
+
+def test_ways_to_win_big() -> None:
+    # Beyond 2^53 a float square root is off by more than one
+    time = 10**30 + 7
+    distance = 10**59
+    ways = ways_to_win(time, distance)
+    first = (time - ways + 1) // 2
+    assert first * (time - first) > distance
+    assert (first - 1) * (time - first + 1) <= distance
+
+
+def test_ways_to_win_many_numpy() -> None:
+    skip_without_numpy()
+    races = [
+        (time, distance)
+        for time in range(200)
+        for distance in range(0, time * time // 4 + 2, 7)
+    ]
+    races = (races * (NUMPY_MIN_ITEMS // len(races) + 1))[:NUMPY_MIN_ITEMS]
+    assert ways_to_win_many(races) == [ways_to_win(t, d) for t, d in races]
+
+
+def test_ways_to_win_many_big_distance() -> None:
+    # Too large for int64 even though the time is small
+    races = [(7, 9)] * NUMPY_MIN_ITEMS + [(100, 2**63)]
+    assert ways_to_win_many(races) == [4] * NUMPY_MIN_ITEMS + [0]
@@ -1,7 +1,30 @@
 #!/usr/bin/env python
-from collections import Counter
-from functools import cached_property
-from typing import Self
+import functools
+import itertools
+import mmap
+import os
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Sequence
+
+from cache import (
+    cache_directory,
+    cache_max_bytes,
+    cached,
+    configure,
+    source_digest,
+    track,
+)
+from loader import (
+    NUMPY_MIN_ITEMS,
+    Inputs,
+    choose_backend,
+    iter_lines,
+    skip_without_numpy,
+    use_numpy,
+)
+from profiling import timed
 
 
 CARD_RANK = {
@@ -32,96 +55,192 @@ TYPE_RANK = {
 }
 
 
-class Hand:
-    def __init__(self, string: str) -> None:
-        assert len(string) == 5
-        self.string = string
-
-    @cached_property
-    def type(self) -> str:
-        counter = Counter(self.string)
-        counts = [count for count in sorted(counter.values())]
-
-        if counts == [5]:
-            return "Five of a kind"
-        elif counts == [1, 4]:
-            return "Four of a kind"
-        elif counts == [2, 3]:
-            return "Full house"
-        elif counts == [1, 1, 3]:
-            return "Three of a kind"
-        elif counts == [1, 2, 2]:
-            return "Two pair"
-        elif counts == [1, 1, 1, 2]:
-            return "One pair"
-        elif counts == [1, 1, 1, 1, 1]:
-            return "High card"
-        else:
-            raise RuntimeError("Unknown hand type")
+# Hand type by the sorted card counts
+HAND_TYPES = {
+    (5,): "Five of a kind",
+    (1, 4): "Four of a kind",
+    (2, 3): "Full house",
+    (1, 1, 3): "Three of a kind",
+    (1, 2, 2): "Two pair",
+    (1, 1, 1, 2): "One pair",
+    (1, 1, 1, 1, 1): "High card",
+}
+
+# Summing the count of every card's value gives a distinct number per hand type
+HAND_TYPE_BY_SIGNATURE = {
+    sum(count * count for count in counts): TYPE_RANK[name]
+    for counts, name in HAND_TYPES.items()
+}
+
+# With jokers the J is the weakest card
+JOKER_CARD_RANK = {
+    card: 0 if card == "J" else rank + (rank < CARD_RANK["J"])
+    for card, rank in CARD_RANK.items()
+}
 
-    @cached_property
-    def rank_tuple(self) -> tuple[int, ...]:
-        return (TYPE_RANK[self.type],) + tuple(CARD_RANK[card] for card in self.string)
+# Card ranks as hex digits, per rule set
+CARD_HEX = {
+    rules: str.maketrans({card: f"{rank:x}" for card, rank in card_rank.items()})
+    for rules, card_rank in (("standard", CARD_RANK), ("joker", JOKER_CARD_RANK))
+}
 
-    def __str__(self) -> str:
-        return self.string
+# Hands are indexed by their cards as a base-13 number
+CARD_BASE13 = str.maketrans({card: f"{rank:x}" for card, rank in CARD_RANK.items()})
+
+NUM_HANDS = len(CARD_RANK) ** 5
 
-    def __repr__(self) -> str:
-        return f"Hand('{self.string}')"
 
-    def __eq__(self, rhs: object) -> bool:
-        if not isinstance(rhs, Hand):
-            raise NotImplemented
-        return self.string == rhs.string
+def hand_key(string: str, rules: str = "standard") -> int:
+    # Type in the top bits, followed by the cards at 4 bits each (one hex digit per
+    # card), so that keys compare like rank tuples
+    cards = int(string.translate(CARD_HEX[rules]), 16)
 
+    if rules == "joker" and "J" in string:
+        # Jokers always do best by joining the most common other card
+        rest = string.replace("J", "")
+        if not rest:
+            return HAND_TYPE_BY_SIGNATURE[25] << 20 | cards
+
+        most = max(map(rest.count, rest))
+        signature = sum(map(rest.count, rest)) - most * most
+        signature += (most + 5 - len(rest)) ** 2
+        return HAND_TYPE_BY_SIGNATURE[signature] << 20 | cards
+
+    signature = sum(map(string.count, string))
+    return HAND_TYPE_BY_SIGNATURE[signature] << 20 | cards
 
-def parse(inputs: str) -> list[int]:
-    hands_and_bids = []
-    for line in inputs.splitlines():
-        hand, bid = line.split()
-        hand = Hand(hand)
-        bid = int(bid)
-        hands_and_bids.append((hand, bid))
 
-    return hands_and_bids
+def hand_index(string: str) -> int:
+    return int(string.translate(CARD_BASE13), 13)
 
 
-def part1(inputs: str) -> int:
-    hands_and_bids = parse(inputs)
+def build_hand_table(rules: str = "standard", backend: str = "auto") -> array:
+    # Key of every possible hand, in hand index order
+    if choose_backend(backend, NUM_HANDS) == "numpy":
+        import numpy as np
 
-    total_winnings = 0
-    for rank, (hand, bid) in enumerate(
-        sorted(hands_and_bids, key=lambda x: x[0].rank_tuple), 1
-    ):
-        total_winnings += rank * bid
+        # Base-13 digits of every hand index, i.e. the standard card ranks
+        digits = np.indices((len(CARD_RANK),) * 5).reshape(5, -1)
+        counts = np.stack([(digits == rank).sum(axis=0) for rank in range(13)])
 
-    return total_winnings
+        signature = (counts * counts).sum(axis=0)
+        card_rank = CARD_RANK
+        if rules == "joker":
+            jokers = counts[CARD_RANK["J"]]
+            rest = np.delete(counts, CARD_RANK["J"], axis=0)
+            most = rest.max(axis=0)
+            signature = (rest * rest).sum(axis=0) - most * most + (most + jokers) ** 2
+            card_rank = JOKER_CARD_RANK
 
+        types = np.zeros(26, dtype=np.int64)
+        for sig, type_rank in HAND_TYPE_BY_SIGNATURE.items():
+            types[sig] = type_rank
 
-def part2(inputs: str) -> int:
-    hands_and_bids = parse(inputs)
+        # Card ranks are listed in standard rank order
+        ranks = np.array(list(card_rank.values()))
+        cards = (ranks[digits] << np.array([[16], [12], [8], [4], [0]])).sum(axis=0)
 
-    # Determine the best hands
-    best_hands = []
-    for hand, bid in hands_and_bids:
-        rank_tuple = tuple(
-            map(lambda x: -1 if x == CARD_RANK["J"] else x, hand.rank_tuple)
-        )
+        return array("i", (types[signature] << 20 | cards).astype(np.int32).tobytes())
 
-        possible_hands = (
-            Hand(str(hand).replace("J", replacement)) for replacement in "23456789TQKA"
-        )
+    hands = itertools.product(CARD_RANK, repeat=5)
+    return array("i", (hand_key("".join(hand), rules) for hand in hands))
+
+
+@functools.cache
+def load_hand_table(rules: str, directory: Path) -> Sequence[int]:
+    # Tables are rebuilt whenever this module changes, and count towards the cache
+    # size limit like cached results
+    path = directory / f"day07-{rules}-{source_digest(__name__)[:16]}.table"
+    size = NUM_HANDS * array("i").itemsize
+
+    # Another worker may evict or replace the file at any point, so everything
+    # after opening goes through the file descriptor
+    try:
+        with open(path, "rb") as fin:
+            if os.fstat(fin.fileno()).st_size == size:
+                os.utime(fin.fileno())
+                buffer = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+                return memoryview(buffer).cast("i")
+    except FileNotFoundError:
+        pass
+
+    for stale_path in directory.glob(f"day07-{rules}-*.table"):
+        if stale_path != path:
+            stale_path.unlink(missing_ok=True)
+
+    # Mapped before it is moved into place, so the mapping never depends on the
+    # final path still existing
+    directory.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "w+b") as fout:
+        build_hand_table(rules).tofile(fout)
+        fout.flush()
+        buffer = mmap.mmap(fout.fileno(), 0, access=mmap.ACCESS_READ)
+    os.replace(tmp_path, path)
+
+    track(path, cache_max_bytes())
+    return memoryview(buffer).cast("i")
+
+
+def hand_table(rules: str = "standard") -> Sequence[int] | None:
+    # Only worth building when it is persisted for later runs
+    directory = cache_directory()
+    if directory is None:
+        return None
+
+    return load_hand_table(rules, directory)
+
+
+@dataclass
+class HandStore:
+    keys: array = field(default_factory=lambda: array("q"))
+    bids: array = field(default_factory=lambda: array("q"))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def total_winnings(self) -> int:
+        if use_numpy(len(self)):
+            import numpy as np
+
+            keys = np.frombuffer(self.keys, dtype=np.int64)
+            bids = np.frombuffer(self.bids, dtype=np.int64)
+            order = np.argsort(keys, kind="stable")
+            return int(bids[order].dot(np.arange(1, len(self) + 1)))
+
+        # The hand index goes in the low bits: one sort of plain ints, stable for
+        # equal hands
+        shift = len(self).bit_length()
+        mask = (1 << shift) - 1
+        packed = sorted([key << shift | i for i, key in enumerate(self.keys)])
+
+        bids = self.bids
+        return sum(rank * bids[p & mask] for rank, p in enumerate(packed, 1))
+
+
+@timed
+def parse_hands(inputs: Inputs, rules: str = "standard") -> HandStore:
+    store = HandStore()
+    table = hand_table(rules)
+    for line in iter_lines(inputs):
+        hand, bid = line.split()
+        if table is None:
+            store.keys.append(hand_key(hand, rules))
+        else:
+            store.keys.append(table[hand_index(hand)])
+        store.bids.append(int(bid))
 
-        best_hand = max(possible_hands, key=lambda h: h.rank_tuple[0])
-        best_hand_rank_tuple = (best_hand.rank_tuple[0],) + rank_tuple[1:]
+    return store
 
-        best_hands.append((best_hand, bid, best_hand_rank_tuple))
 
-    total_winnings = 0
-    for rank, (hand, bid, _) in enumerate(sorted(best_hands, key=lambda x: x[2]), 1):
-        total_winnings += rank * bid
+@cached
+def part1(inputs: Inputs) -> int:
+    return parse_hands(inputs).total_winnings()
 
-    return total_winnings
+
+@cached
+def part2(inputs: Inputs) -> int:
+    return parse_hands(inputs, rules="joker").total_winnings()
 
 
 TEST_INPUT = """\
@@ -140,9 +259,86 @@ def test_example2() -> None:
     assert part2(TEST_INPUT) == 5905
 
 
-if __name__ == "__main__":
-    with open("inputs/day07.txt") as fin:
-        inputs = fin.read()
+def test_example1_streaming() -> None:
+    assert part1(iter(TEST_INPUT.encode().splitlines(keepends=True))) == 6440
+
+
+def hand_type(string: str) -> int:
+    # Straight from the definition, to check the keys against
+    counts = tuple(sorted(map(string.count, set(string))))
+    return TYPE_RANK[HAND_TYPES[counts]]
+
+
+def test_hand_key() -> None:
+    hands = [line.split()[0] for line in TEST_INPUT.splitlines()]
+    for hand in hands:
+        assert hand_key(hand) >> 20 == hand_type(hand)
+
+    assert sorted(hands, key=hand_key) == ["32T3K", "KTJJT", "KK677", "T55J5", "QQQJA"]
+    assert hand_key("AAAAA") > hand_key("22223") > hand_key("AAAKK")
+
+
+def test_hand_key_jokers() -> None:
+    hands = ["JJJJJ", "JJJJ2", "T55J5", "KTJJT", "2345J", "2233J", "QQQJA", "32T3K"]
+    for hand in hands:
+        best_type = max(hand_type(hand.replace("J", card)) for card in "23456789TQKA")
+        assert hand_key(hand, rules="joker") >> 20 == best_type
+
+    assert hand_key("J2345", rules="joker") < hand_key("22345", rules="joker")
+    assert hand_key("JKKK2", rules="joker") < hand_key("QQQQ2", rules="joker")
+
+
+def test_hand_table(tmp_path: Path) -> None:
+    table = load_hand_table("joker", tmp_path)
+    assert len(table) == NUM_HANDS
+    for hand in ["22222", "AAAAA", "KTJJT", "T55J5", "2345J", "J2345", "32T3K"]:
+        assert table[hand_index(hand)] == hand_key(hand, rules="joker")
+
+    # A second load maps the persisted file
+    (path,) = tmp_path.glob("*.table")
+    load_hand_table.cache_clear()
+    assert load_hand_table("joker", tmp_path) == table
+    assert list(tmp_path.glob("*.table")) == [path]
+
+    # Rebuilding removes tables of older sources
+    path.rename(tmp_path / "day07-joker-0000000000000000.table")
+    load_hand_table.cache_clear()
+    assert load_hand_table("joker", tmp_path) == table
+    assert list(tmp_path.glob("*.table")) == [path]
+
+    # A table removed after it was built stays mapped
+    load_hand_table.cache_clear()
+    table = load_hand_table("joker", tmp_path)
+    path.unlink()
+    assert table[hand_index("KTJJT")] == hand_key("KTJJT", rules="joker")
+
+
+def test_build_hand_table_numpy() -> None:
+    skip_without_numpy()
+    for rules in ("standard", "joker"):
+        table = build_hand_table(rules, backend="numpy")
+        hands = itertools.islice(itertools.product(CARD_RANK, repeat=5), 0, None, 101)
+        for hand in map("".join, hands):
+            assert table[hand_index(hand)] == hand_key(hand, rules)
+
+
+def test_parts_with_hand_table(tmp_path: Path) -> None:
+    hands = [line.split()[0] for line in TEST_INPUT.splitlines()]
+    try:
+        configure(tmp_path)
+        keys = parse_hands(TEST_INPUT, rules="joker").keys
+        assert keys.tolist() == [hand_key(hand, rules="joker") for hand in hands]
+        assert part1(TEST_INPUT) == 6440
+        assert part2(TEST_INPUT) == 5905
+    finally:
+        configure(None)
+
 
-    print(f"Part 1: {part1(inputs)}")
-    print(f"Part 2: {part2(inputs)}")
+def test_total_winnings_numpy() -> None:
+    skip_without_numpy()
+    store = parse_hands("\n".join([TEST_INPUT] * (NUMPY_MIN_ITEMS // 5)))
+    assert len(store) >= NUMPY_MIN_ITEMS
+    assert store.total_winnings() == sum(
+        rank * bid
+        for rank, (_, bid) in enumerate(sorted(zip(store.keys, store.bids)), 1)
+    )
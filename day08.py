@@ -1,9 +1,13 @@
 #!/usr/bin/env python
-import pytest
 import re
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import cached_property
 from itertools import cycle
+from typing import Self
+
+from cache import cached
+from profiling import count, timed
 
 
 @dataclass
@@ -12,6 +16,7 @@ class TreeNode:
     right: str
 
 
+@timed
 def parse(inputs: str) -> tuple[str, dict[str, TreeNode]]:
     lines = inputs.splitlines()
     directions = lines[0]
@@ -30,152 +35,110 @@ def parse(inputs: str) -> tuple[str, dict[str, TreeNode]]:
     return directions, nodes
 
 
-def perform_step(current_node: str, direction: str, nodes: dict[str, TreeNode]) -> str:
-    if direction == "L":
-        return nodes[current_node].left
-    elif direction == "R":
-        return nodes[current_node].right
-    else:
-        raise RuntimeError("Unknown direction")
+@dataclass
+class Network:
+    # Directions as 0 (left) or 1 (right), and the successors of node `i` at
+    # `2 * i + direction`. Nodes that are only referenced get ids after the defined
+    # ones and have no successors
+    directions: bytes
+    names: list[str]
+    successors: list[int]
+    ids: dict[str, int] = field(repr=False)
+
+    @classmethod
+    def compile(cls, directions: str, nodes: dict[str, TreeNode]) -> Self:
+        if directions.strip("LR"):
+            raise RuntimeError("Unknown direction")
+
+        ids = {name: i for i, name in enumerate(nodes)}
+        successors = [
+            ids.setdefault(name, len(ids))
+            for node in nodes.values()
+            for name in (node.left, node.right)
+        ]
+
+        encoded = directions.encode().translate(bytes.maketrans(b"LR", b"\x00\x01"))
+        return cls(encoded, list(ids), successors, ids)
+
+    @cached_property
+    def is_end(self) -> list[bool]:
+        return [name.endswith("Z") for name in self.names]
 
 
-def part1(inputs: str) -> int | None:
-    directions, nodes = parse(inputs)
+@dataclass
+class Cycle:
+    # Steps before the walk starts repeating, the period, and the steps into the
+    # period at which an end node is visited
+    start: int
+    length: int
+    end_offsets: list[int]
 
-    current_node = "AAA"
-    for step, direction in enumerate(cycle(directions)):
-        if current_node == "ZZZ":
+
+@cached
+def part1(inputs: str) -> int | None:
+    network = Network.compile(*parse(inputs))
+    successors = network.successors
+
+    current_node = network.ids["AAA"]
+    end_node = network.ids["ZZZ"]
+    for step, direction in enumerate(cycle(network.directions)):
+        if current_node == end_node:
+            count("day08.steps", step)
             return step
 
-        current_node = perform_step(current_node, direction, nodes)
+        current_node = successors[2 * current_node + direction]
 
     return None
 
 
-def find_cycle(starting_node: str, directions: str, nodes: dict[str, TreeNode]) -> tuple[int, int] | None:
+def find_cycle(starting_node: int, network: Network) -> Cycle:
+    directions = network.directions
+    successors = network.successors
+    is_end = network.is_end
+    num_nodes = len(network.names)
+
+    # Step at which every (instruction index, node) state was first seen, keyed by
+    # a single int
+    first_seen = {}
+    end_steps = []
+
     current_node = starting_node
-    visit_history = [(len(directions), current_node)]
+    for step, (idx, direction) in enumerate(cycle(enumerate(directions))):
+        state = idx * num_nodes + current_node
+        if state in first_seen:
+            count("day08.steps", step)
+            cycle_start = first_seen[state]
+            end_offsets = [s - cycle_start for s in end_steps if s >= cycle_start]
+            return Cycle(cycle_start, step - cycle_start, end_offsets)
 
-    for idx, direction in cycle(enumerate(directions, 1)):
-        current_node = perform_step(current_node, direction, nodes)
+        first_seen[state] = step
+        if is_end[current_node]:
+            end_steps.append(step)
 
-        if (idx, current_node) in visit_history:
-            cycle_start = visit_history.index((idx, current_node))
-            cycle_length = len(visit_history) - cycle_start
-            return cycle_start, cycle_length
-        else:
-            visit_history.append((idx, current_node))
+        current_node = successors[2 * current_node + direction]
 
-    return None
+    raise AssertionError("unreachable")
 
 
+@cached
 def part2(inputs: str) -> int:
-    directions, nodes = parse(inputs)
-    current_nodes = [node for node in nodes if node.endswith("A")]
+    network = Network.compile(*parse(inputs))
 
     # Find cycles
     cycle_lengths = []
-    for node in current_nodes:
-        c = find_cycle(node, directions, nodes)
-        assert c is not None
-        cycle_start, cycle_length = c
-        assert cycle_length % len(directions) == 0
-
-        current_node = node
+    for node, name in enumerate(network.names[: len(network.successors) // 2]):
+        if not name.endswith("A"):
+            continue
 
-        steps = None
-        for step, direction in enumerate(cycle(directions)):
-            if current_node.endswith("Z"):
-                steps = step
-                break
+        c = find_cycle(node, network)
+        assert c.length % len(network.directions) == 0
 
-            current_node = perform_step(current_node, direction, nodes)
+        # Every multiple of the cycle length ends on a Z node, which is what makes
+        # the answer the LCM of the lengths
+        assert c.length - c.start in c.end_offsets
 
-        # For some reason the first **Z is always equal to the length of the cycle
-        print(f"{node} -> {cycle_start = } {cycle_length = } {steps = }")
-        cycle_lengths.append(cycle_length)
+        cycle_lengths.append(c.length)
 
     import math
 
     return math.lcm(*cycle_lengths)
-
-
-TEST_INPUT_1 = """\
-RL
-
-AAA = (BBB, CCC)
-BBB = (DDD, EEE)
-CCC = (ZZZ, GGG)
-DDD = (DDD, DDD)
-EEE = (EEE, EEE)
-GGG = (GGG, GGG)
-ZZZ = (ZZZ, ZZZ)"""
-
-
-TEST_INPUT_2 = """\
-LLR
-
-AAA = (BBB, BBB)
-BBB = (AAA, ZZZ)
-ZZZ = (ZZZ, ZZZ)"""
-
-TEST_INPUT_3 = """\
-LR
-
-11A = (11B, XXX)
-11B = (XXX, 11Z)
-11Z = (11B, XXX)
-22A = (22B, XXX)
-22B = (22C, 22C)
-22C = (22Z, 22Z)
-22Z = (22B, 22B)
-XXX = (XXX, XXX)"""
-
-
-@pytest.mark.parametrize(
-    "input,expected",
-    [
-        (TEST_INPUT_1, 2),
-        (TEST_INPUT_2, 6),
-    ],
-    ids=["TEST_INPUT_1", "TEST_INPUT_2"],
-)
-def test_part1(input: str, expected: int) -> None:
-    assert part1(input) == expected
-
-
-def test_part2() -> None:
-    assert part2(TEST_INPUT_3) == 6
-
-
-def test_cycle_start0_len3() -> None:
-    test_input = """\
-LLL
-
-AAA = (BBB, XXX)
-BBB = (CCC, XXX)
-CCC = (AAA, XXX)"""
-    directions, nodes = parse(test_input)
-    assert find_cycle("AAA", directions, nodes) == (0, 3)
-
-
-def test_cycle_start2_len12() -> None:
-    test_input = """\
-LLL
-
-AAA = (BBB, XXX)
-BBB = (CCC, XXX)
-CCC = (DDD, XXX)
-DDD = (EEE, XXX)
-EEE = (FFF, XXX)
-FFF = (CCC, XXX)"""
-    directions, nodes = parse(test_input)
-    assert find_cycle("AAA", directions, nodes) == (2, 12)
-
-
-if __name__ == "__main__":
-    with open("inputs/day08.txt") as fin:
-        inputs = fin.read()
-
-    print(f"Part 1: {part1(inputs)}")
-    print(f"Part 2: {part2(inputs)}")
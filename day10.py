@@ -1,5 +1,6 @@
 #!/usr/bin/env python
-import pytest
+
+from cache import cached
 
 
 def pipe_connections(char: str) -> tuple[str, ...]:
@@ -81,6 +82,7 @@ def walk(maze: list[list[str]], start: tuple[int, int]) -> list[tuple[int, int]]
     return path
 
 
+@cached
 def part1(inputs: str) -> int:
     maze = list(map(list, inputs.splitlines()))
     start = find_start(maze)
@@ -90,6 +92,7 @@ def part1(inputs: str) -> int:
     return len(path) // 2
 
 
+@cached
 def part2(inputs: str) -> int:
     maze = list(map(list, inputs.splitlines()))
     start = find_start(maze)
@@ -98,106 +101,3 @@ def part2(inputs: str) -> int:
     path = walk(maze, start)
 
     return 0
-
-
-LOOP_1 = """\
-.....
-.S-7.
-.|.|.
-.L-J.
-....."""
-
-LOOP_2 = """\
--L|F7
-7S-7|
-L|7||
--L-J|
-L|-JF"""
-
-LOOP_3 = """\
-..F7.
-.FJ|.
-SJ.L7
-|F--J
-LJ..."""
-
-LOOP_4 = """\
-...........
-.S-------7.
-.|F-----7|.
-.||.....||.
-.||.....||.
-.|L-7.F-J|.
-.|..|.|..|.
-.L--J.L--J.
-..........."""
-
-LOOP_5 = """\
-.F----7F7F7F7F-7....
-.|F--7||||||||FJ....
-.||.FJ||||||||L7....
-FJL7L7LJLJ||LJ.L-7..
-L--J.L7...LJS7F-7L7.
-....F-J..F7FJ|L7L7L7
-....L7.F7||L7|.L7L7|
-.....|FJLJ|FJ|F7|.LJ
-....FJL-7.||.||||...
-....L---J.LJ.LJLJ..."""
-
-LOOP_6 = """\
-FF7FSF7F7F7F7F7F---7
-L|LJ||||||||||||F--J
-FL-7LJLJ||||||LJL-77
-F--JF--7||LJLJ7F7FJ-
-L---JF-JLJ.||-FJLJJ7
-|F|F-JF---7F7-L7L|7|
-|FFJF7L7F-JF7|JL---7
-7-L-JL7||F7|L7F-7F7|
-L.L7LFJ|||||FJL7||LJ
-L7JLJL-JLJLJL--JLJ.L"""
-
-
-@pytest.mark.parametrize(
-    "inputs",
-    [
-        LOOP_1,
-        LOOP_2,
-    ],
-    ids=["loop1", "loop2"],
-)
-def test_simple_loop(inputs: str) -> None:
-    maze = list(map(list, inputs.splitlines()))
-    start = find_start(maze)
-    assert start is not None
-    
-    path = walk(maze, start)
-
-    assert path == [(1, 1), (1, 2), (1, 3), (2, 3), (3, 3), (3, 2), (3, 1), (2, 1)]
-
-
-@pytest.mark.parametrize(
-    "inputs, expected",
-    [
-        (LOOP_2, 4),
-        (LOOP_3, 8),
-    ],
-    ids=["loop2", "loop3"],
-)
-def test_farthest_point(inputs: str, expected: int) -> None:
-    assert part1(inputs) == expected
-
-
-@pytest.mark.parametrize(
-    "inputs, expected",
-    [(LOOP_4, 4), (LOOP_5, 8), (LOOP_6, 10)],
-    ids=["loop4", "loop5", "loop6"],
-)
-def test_tiles_contained(inputs: str, expected: int) -> None:
-    assert part2(inputs) == expected
-
-
-if __name__ == "__main__":
-    with open("inputs/day10.txt") as fin:
-        inputs = fin.read()
-
-    print(f"Part 1: {part1(inputs)}")
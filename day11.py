@@ -1,7 +1,11 @@
 #!/usr/bin/env python
 from itertools import combinations
 
+from cache import cached
+from profiling import timed
 
+
+@timed
 def parse(inputs: str) -> list[list[str]]:
     return list(map(lambda x: list(x), inputs.splitlines()))
 
@@ -75,6 +79,7 @@ def get_galaxy_coords(galaxy: list[list[str]]) -> list[tuple[int, int]]:
     return galaxies
 
 
+@cached
 def part1(inputs: str) -> int:
     galaxy = expand(parse(inputs))
     coords = get_galaxy_coords(galaxy)
@@ -88,6 +93,7 @@ def part1(inputs: str) -> int:
     return total_distance
 
 
+@cached
 def part2(inputs: str, factor: int = 1000000) -> int:
     galaxy = parse(inputs)
     coords = get_galaxy_coords(galaxy)
@@ -155,11 +161,3 @@ def test_part1() -> None:
 
 def test_part1_smarter() -> None:
     assert part2(TEST_INPUT, factor=2) == 374
-
-
-if __name__ == "__main__":
-    with open("inputs/day11.txt") as fin:
-        inputs = fin.read()
-
-    print(f"Part 1: {part1(inputs)}")
-    print(f"Part 2: {part2(inputs)}")
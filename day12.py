@@ -1,9 +1,12 @@
 #!/usr/bin/env python
-import pytest
 from functools import cache
 from typing import Generator
 
+from cache import cached
+from profiling import count, enabled, timed
 
+
+@timed
 def parse(inputs: str) -> Generator[tuple[str, list[int]], None, None]:
     for line in inputs.splitlines():
         record, runs = line.split()
@@ -40,9 +43,17 @@ def count_arrangements(record: str, runs: list[int]) -> int:
 
         return arrangements
 
-    return f(0, 0, 0)
+    arrangements = f(0, 0, 0)
+
+    if enabled():
+        cache_info = f.cache_info()
+        count("day12.count_arrangements.hits", cache_info.hits)
+        count("day12.count_arrangements.misses", cache_info.misses)
 
+    return arrangements
 
+
+@cached
 def part1(inputs: str) -> int:
     total = 0
     for record, runs in parse(inputs):
@@ -51,50 +62,10 @@ def part1(inputs: str) -> int:
     return total
 
 
+@cached
 def part2(inputs: str) -> int:
     total = 0
     for i, (record, runs) in enumerate(parse(inputs)):
         total += count_arrangements("?".join(5 * [record]), 5 * runs)
 
     return total
-
-
-TEST_INPUTS = [
-    ("#.#.### 1,1,3", 1),
-    ("???.### 1,1,3", 1),
-    (".??..??...?##. 1,1,3", 4),
-    ("?#?#?#?#?#?#?#? 1,3,1,6", 1),
-    ("????.#...#... 4,1,1", 1),
-    ("????.######..#####. 1,6,5", 4),
-    ("?###???????? 3,2,1", 10),
-]
-
-
-@pytest.mark.parametrize("inputs, expected", TEST_INPUTS)
-def test_count_arrangements(inputs: str, expected: int) -> None:
-    record, runs = next(parse(inputs))
-    assert count_arrangements(record, runs) == expected
-
-
-TEST_INPUTS_PT2 = [
-    ("???.### 1,1,3", 1),
-    (".??..??...?##. 1,1,3", 16384),
-    ("?#?#?#?#?#?#?#? 1,3,1,6", 1),
-    ("????.#...#... 4,1,1", 16),
-    ("????.######..#####. 1,6,5", 2500),
-    ("?###???????? 3,2,1", 506250),
-]
-
-
-@pytest.mark.parametrize("inputs, expected", TEST_INPUTS_PT2)
-def test_count_arrangements_pt2(inputs: str, expected: int) -> None:
-    record, runs = next(parse(inputs))
-    assert count_arrangements("?".join(5 * [record]), 5 * runs) == expected
-
-
-if __name__ == "__main__":
-    with open("inputs/day12.txt") as fin:
-        inputs = fin.read()
-
-    print(f"Part 1: {part1(inputs)}")
-    print(f"Part 2: {part2(inputs)}")
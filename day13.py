@@ -1,5 +1,8 @@
 from functools import cached_property
 
+from cache import cached
+from profiling import count, timed
+
 
 class Grid:
     def __init__(self, grid_str):
@@ -47,6 +50,7 @@ def find_reflection(x):
 
 
 def find_smudge(x):
+    comparisons = 0
     for axis in range(0, len(x) - 1):
         mismatch_count = 0
         mismatch_index = None
@@ -55,6 +59,7 @@ def find_smudge(x):
         right_idx = axis + 1
         while left_idx >= 0 and right_idx < len(x):
             mismatch = [lhs != rhs for lhs, rhs in zip(x[left_idx], x[right_idx])]
+            comparisons += 1
 
             mismatch_count += sum(mismatch)
             if mismatch_count == 1:
@@ -67,8 +72,10 @@ def find_smudge(x):
             right_idx += 1
 
         if mismatch_count == 1:
+            count("day13.find_smudge.comparisons", comparisons)
             return mismatch_index
 
+    count("day13.find_smudge.comparisons", comparisons)
     return None
 
 
@@ -94,11 +101,13 @@ def remove_smudge(grid):
     return None
 
 
+@timed
 def parse(inputs):
     for grid_str in inputs.split("\n\n"):
         yield Grid(grid_str)
 
 
+@cached
 def part1(inputs):
     total = 0
     for grid in parse(inputs):
@@ -119,6 +128,7 @@ def part1(inputs):
     return total
 
 
+@cached
 def part2(inputs):
     total = 0
     for grid in parse(inputs):
@@ -259,10 +269,3 @@ def test_part1():
 
 def test_part2():
     assert part2(TEST_INPUT) == 400
-
-
-if __name__ == "__main__":
-    with open("inputs/day13.txt") as fin:
-        inputs = fin.read()
-
-    print(f"Part 1: {part1(inputs)}")
@@ -1,3 +1,8 @@
+from cache import cached
+from profiling import timed
+
+
+@timed
 def parse(inputs: str) -> list[list[str]]:
     return list(map(lambda x: list(x), inputs.splitlines()))
 
@@ -30,6 +35,7 @@ def get_load(rows: list[list[str]]) -> int:
     return total_load
 
 
+@cached
 def part1(inputs: str) -> int:
     grid = parse(inputs)
     grid_tilted = tilt_north(grid)
@@ -77,10 +83,3 @@ def test_load() -> None:
 
 def test_part1() -> None:
     assert part1(TEST_INPUT) == 136
-
-
-if __name__ == "__main__":
-    with open("inputs/day14.txt") as fin:
-        inputs = fin.read()
-
-    print(f"Part 1: {part1(inputs)}")
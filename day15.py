@@ -1,9 +1,15 @@
-import pytest
 from collections import OrderedDict
+from typing import Generator
 
+from cache import cached
+from loader import Buffer, iter_split
+from profiling import timed
 
-def parse(inputs: str) -> list[str]:
-    return [split.strip() for split in inputs.split(",")]
+
+@timed
+def parse(inputs: str | Buffer) -> Generator[str, None, None]:
+    for split in iter_split(inputs, ","):
+        yield split.strip()
 
 
 def aoc_hash(string: str) -> int:
@@ -16,7 +22,8 @@ def aoc_hash(string: str) -> int:
     return val
 
 
-def part1(inputs: str) -> int:
+@cached
+def part1(inputs: str | Buffer) -> int:
     sum = 0
     for init_seq in parse(inputs):
         if init_seq == "\n":
@@ -25,7 +32,7 @@ def part1(inputs: str) -> int:
     return sum
 
 
-def run_instructions(inputs: str) -> list[OrderedDict[str, int]]:
+def run_instructions(inputs: str | Buffer) -> list[OrderedDict[str, int]]:
     boxes: list[OrderedDict[str, int]] = [OrderedDict() for _ in range(256)]
 
     for instruction in parse(inputs):
@@ -44,7 +51,8 @@ def run_instructions(inputs: str) -> list[OrderedDict[str, int]]:
     return boxes
 
 
-def part2(inputs: str) -> int:
+@cached
+def part2(inputs: str | Buffer) -> int:
     boxes = run_instructions(inputs)
 
     total = 0
@@ -54,42 +62,3 @@ def part2(inputs: str) -> int:
             total += (box_num + 1) * slot_num * focal_length
     
     return total
-
-
-@pytest.mark.parametrize(
-    "string, expected",
-    [
-        ("HASH", 52),
-        ("rn=1", 30),
-        ("cm-", 253),
-        ("qp=3", 97),
-        ("pc-", 48),
-    ],
-)
-def test_hash(string: str, expected: int) -> None:
-    assert aoc_hash(string) == expected
-
-
-TEST_INPUT = "rn=1,cm-,qp=3,cm=2,qp-,pc=4,ot=9,ab=5,pc-,pc=6,ot=7"
-
-
-def test_part1() -> None:
-    assert part1(TEST_INPUT) == 1320
-
-
-def test_run_instructions() -> None:
-    boxes = run_instructions(TEST_INPUT)
-    assert boxes[0] == OrderedDict(rn=1, cm=2)
-    assert boxes[3] == OrderedDict(ot=7, ab=5, pc=6)
-
-
-def test_part2() -> None:
-    assert part2(TEST_INPUT) == 145
-
-
-if __name__ == "__main__":
-    with open("inputs/day15.txt") as fin:
-        inputs = fin.read()
-
-    print(f"Part 1: {part1(inputs)}")
-    print(f"Part 2: {part2(inputs)}")
@@ -0,0 +1,360 @@
+#!/usr/bin/env python
+import random
+import string
+from typing import Callable
+
+
+DIGIT_WORDS = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+ALMANAC_CATEGORIES = [
+    "seed",
+    "soil",
+    "fertilizer",
+    "water",
+    "light",
+    "temperature",
+    "humidity",
+    "location",
+]
+
+
+def generate_day01(n: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+
+    lines = []
+    for _ in range(n):
+        tokens = [rng.choice("123456789")]
+        for _ in range(rng.randint(2, 8)):
+            match rng.randrange(3):
+                case 0:
+                    tokens.append(rng.choice("123456789"))
+                case 1:
+                    tokens.append(rng.choice(DIGIT_WORDS))
+                case _:
+                    tokens.append("".join(rng.choices(string.ascii_lowercase, k=3)))
+
+        rng.shuffle(tokens)
+        lines.append("".join(tokens))
+
+    return "\n".join(lines)
+
+
+def generate_day02(n: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+
+    lines = []
+    for game_id in range(1, n + 1):
+        draws = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(["red", "green", "blue"], rng.randint(1, 3))
+            draws.append(", ".join(f"{rng.randint(1, 20)} {c}" for c in colors))
+
+        lines.append(f"Game {game_id}: " + "; ".join(draws))
+
+    return "\n".join(lines)
+
+
+def generate_day03(n: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+
+    lines = []
+    for _ in range(n):
+        line = ""
+        while len(line) < n:
+            r = rng.random()
+            if r < 0.1:
+                line += str(rng.randint(1, 999)) + "."
+            elif r < 0.13:
+                line += rng.choice("***#+$/@=%-&")
+            else:
+                line += "."
+
+        lines.append(line[:n])
+
+    return "\n".join(lines)
+
+
+def generate_day04(n: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+
+    lines = []
+    for card_num in range(1, n + 1):
+        # Keep the expected number of copies bounded, like the real puzzle
+        num_matches = min(rng.choice([0, 0, 0, 0, 1, 1, 2, 3]), n - card_num)
+
+        numbers = rng.sample(range(1, 100), 35 - num_matches)
+        winning = numbers[:10]
+        held = winning[:num_matches] + numbers[10:]
+        rng.shuffle(held)
+
+        lines.append(
+            f"Card {card_num:3}: "
+            + " ".join(f"{x:2}" for x in winning)
+            + " | "
+            + " ".join(f"{x:2}" for x in held)
+        )
+
+    return "\n".join(lines)
+
+
+def generate_day05(n: int, seed: int = 0, num_seeds: int = 20) -> str:
+    rng = random.Random(seed)
+    space = 10 * n * 1000
+
+    seeds = []
+    for _ in range(num_seeds // 2):
+        seeds += [rng.randrange(space), rng.randint(1, space // 100)]
+
+    sections = [f"seeds: {' '.join(map(str, seeds))}"]
+    for source, destination in zip(ALMANAC_CATEGORIES, ALMANAC_CATEGORIES[1:]):
+        # Non-overlapping source ranges, shuffled onto destination ranges
+        bounds = sorted(rng.sample(range(space), 2 * n))
+        starts, ends = bounds[::2], bounds[1::2]
+        destinations = rng.sample(range(space), n)
+
+        entries = [
+            f"{dst} {src} {end - src}"
+            for src, end, dst in zip(starts, ends, destinations)
+        ]
+        rng.shuffle(entries)
+        sections.append(f"{source}-to-{destination} map:\n" + "\n".join(entries))
+
+    return "\n\n".join(sections)
+
+
+def generate_day06(n: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+
+    times = [rng.randint(10, 100) for _ in range(n)]
+    distances = [rng.randint(t, t * t // 4 - 1) for t in times]
+
+    return (
+        "Time:      " + " ".join(f"{t:5}" for t in times) + "\n"
+        "Distance:  " + " ".join(f"{d:5}" for d in distances)
+    )
+
+
+def generate_day07(n: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+
+    lines = []
+    for _ in range(n):
+        hand = "".join(rng.choices("23456789TJQKA", k=5))
+        lines.append(f"{hand} {rng.randint(1, 1000)}")
+
+    return "\n".join(lines)
+
+
+def generate_day08(
+    n: int, seed: int = 0, num_ghosts: int = 4, directions_length: int = 11
+) -> str:
+    rng = random.Random(seed)
+    alphabet = string.ascii_uppercase + string.digits
+
+    # Every ghost runs through a loop whose length is a multiple of the number of
+    # directions, ending on its **Z node, which is the structure of the puzzle input
+    cycle_multiple = max(1, n // (num_ghosts * directions_length))
+    cycle_length = cycle_multiple * directions_length
+
+    names = set()
+    while len(names) < num_ghosts * (cycle_length - 1):
+        name = "".join(rng.choices(alphabet, k=3))
+        if name[-1] not in "AZ":
+            names.add(name)
+
+    inner_names = sorted(names)
+    rng.shuffle(inner_names)
+
+    directions = "".join(rng.choices("LR", k=directions_length))
+    lines = []
+    for ghost in range(num_ghosts):
+        prefix = "AA" if ghost == 0 else f"{ghost:02}"
+        start = f"{prefix}A"
+        end = "ZZZ" if ghost == 0 else f"{prefix}Z"
+
+        inner = inner_names[ghost * (cycle_length - 1) : (ghost + 1) * (cycle_length - 1)]
+        loop = inner + [end]
+        lines.append(f"{start} = ({loop[0]}, {loop[0]})")
+        for node, successor in zip(loop, loop[1:] + loop[:1]):
+            lines.append(f"{node} = ({successor}, {successor})")
+
+    rng.shuffle(lines)
+    return directions + "\n\n" + "\n".join(lines)
+
+
+def generate_day09(n: int, seed: int = 0, length: int = 21) -> str:
+    rng = random.Random(seed)
+
+    lines = []
+    for _ in range(n):
+        coefficients = [rng.randint(-5, 5) for _ in range(rng.randint(1, 6))]
+        history = [
+            sum(c * x**power for power, c in enumerate(coefficients))
+            for x in range(length)
+        ]
+        lines.append(" ".join(map(str, history)))
+
+    return "\n".join(lines)
+
+
+def generate_day10(n: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+
+    # A serpentine loop over the interior of the grid, framed by ground tiles
+    rows = max(2, n - 2) // 2 * 2
+    cols = max(2, n - 2)
+
+    path = [(0, c) for c in range(cols)]
+    for r in range(1, rows):
+        columns = range(cols - 1, 0, -1) if r % 2 == 1 else range(1, cols)
+        path += [(r, c) for c in columns]
+    path += [(r, 0) for r in range(rows - 1, 0, -1)]
+
+    symbols = {
+        frozenset("NS"): "|",
+        frozenset("EW"): "-",
+        frozenset("NE"): "L",
+        frozenset("NW"): "J",
+        frozenset("SW"): "7",
+        frozenset("ES"): "F",
+    }
+
+    def direction(src: tuple[int, int], dst: tuple[int, int]) -> str:
+        match (dst[0] - src[0], dst[1] - src[1]):
+            case (-1, 0):
+                return "N"
+            case (1, 0):
+                return "S"
+            case (0, 1):
+                return "E"
+            case _:
+                return "W"
+
+    grid = [["."] * (cols + 2) for _ in range(rows + 2)]
+    for i, tile in enumerate(path):
+        prev_tile = path[i - 1]
+        next_tile = path[(i + 1) % len(path)]
+        connections = frozenset(
+            [direction(tile, prev_tile), direction(tile, next_tile)]
+        )
+        grid[tile[0] + 1][tile[1] + 1] = symbols[connections]
+
+    start = rng.choice(path)
+    grid[start[0] + 1][start[1] + 1] = "S"
+
+    return "\n".join("".join(row) for row in grid)
+
+
+def generate_day11(n: int, seed: int = 0, density: float = 0.02) -> str:
+    rng = random.Random(seed)
+
+    lines = []
+    for _ in range(n):
+        lines.append("".join("#" if rng.random() < density else "." for _ in range(n)))
+
+    return "\n".join(lines)
+
+
+def generate_day12(n: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+
+    lines = []
+    for _ in range(n):
+        springs = ["#"] + rng.choices("#.", k=rng.randint(4, 19))
+        rng.shuffle(springs)
+        runs = [len(run) for run in "".join(springs).split(".") if run]
+
+        record = "".join("?" if rng.random() < 0.4 else c for c in springs)
+        lines.append(f"{record} {','.join(map(str, runs))}")
+
+    return "\n".join(lines)
+
+
+def generate_day13(n: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+
+    def reflection(x: list[str]) -> list[int]:
+        return [
+            i
+            for i in range(1, len(x))
+            if all(a == b for a, b in zip(reversed(x[:i]), x[i:]))
+        ]
+
+    patterns = []
+    while len(patterns) < n:
+        width = rng.randint(5, 17)
+        half = ["".join(rng.choices(".#", k=width)) for _ in range(rng.randint(1, 4))]
+        extra = ["".join(rng.choices(".#", k=width)) for _ in range(rng.randint(0, 4))]
+        rows = extra + half + half[::-1]
+        columns = ["".join(col) for col in zip(*rows)]
+
+        if rng.random() < 0.5:
+            rows, columns = columns, rows
+
+        # Reject patterns with accidental additional axes
+        if len(reflection(rows)) + len(reflection(columns)) == 1:
+            patterns.append("\n".join(rows))
+
+    return "\n\n".join(patterns)
+
+
+def generate_day14(n: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+
+    lines = []
+    for _ in range(n):
+        lines.append("".join(rng.choices("O#.", weights=[2, 1, 5], k=n)))
+
+    return "\n".join(lines)
+
+
+def generate_day15(n: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+
+    labels = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 6)))
+        for _ in range(max(1, n // 10))
+    ]
+
+    steps = []
+    for _ in range(n):
+        label = rng.choice(labels)
+        if rng.random() < 0.7:
+            steps.append(f"{label}={rng.randint(1, 9)}")
+        else:
+            steps.append(f"{label}-")
+
+    return ",".join(steps)
+
+
+GENERATORS: dict[str, Callable[..., str]] = {
+    f"day{day:02}": globals()[f"generate_day{day:02}"] for day in range(1, 16)
+}
+
+
+def test_deterministic() -> None:
+    for generate in GENERATORS.values():
+        assert generate(10, seed=1) == generate(10, seed=1)
+
+
+def test_day10_loop() -> None:
+    import day10
+
+    inputs = generate_day10(12)
+    assert day10.part1(inputs) == 10 * 10 // 2
+
+
+def test_day13_reflections() -> None:
+    import day13
+
+    inputs = generate_day13(50)
+
+    # Every generated pattern has exactly one axis, found here by brute force
+    expected = 0
+    for pattern in inputs.split("\n\n"):
+        rows = pattern.splitlines()
+        for factor, lines in ((100, rows), (1, ["".join(c) for c in zip(*rows)])):
+            for i in range(1, len(lines)):
+                if all(a == b for a, b in zip(reversed(lines[:i]), lines[i:])):
+                    expected += factor * i
+
+    assert day13.part1(inputs) == expected == 8755
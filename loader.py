@@ -0,0 +1,189 @@
+import contextlib
+import functools
+import mmap
+import os
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Iterable, Iterator
+
+
+Buffer = bytes | bytearray | memoryview | mmap.mmap
+Inputs = str | Buffer | Iterable[str] | Iterable[bytes]
+
+# numpy is optional and only used past these input sizes: below them importing it
+# and converting the input to arrays costs more than the vectorised code saves
+NUMPY_MIN_BYTES = 1 << 20
+NUMPY_MIN_CELLS = 1 << 16
+NUMPY_MIN_ITEMS = 10_000
+
+
+@functools.cache
+def has_numpy() -> bool:
+    return find_spec("numpy") is not None
+
+
+def use_numpy(size: int, min_size: int = NUMPY_MIN_ITEMS) -> bool:
+    return size >= min_size and has_numpy()
+
+
+def choose_backend(backend: str, size: int, min_size: int = NUMPY_MIN_ITEMS) -> str:
+    if backend == "auto":
+        return "numpy" if use_numpy(size, min_size) else "python"
+
+    return backend
+
+
+def skip_without_numpy() -> None:
+    # For tests of the numpy paths
+    import pytest
+
+    pytest.importorskip("numpy")
+
+
+@contextlib.contextmanager
+def open_input(path: Path | str) -> Iterator[bytes | mmap.mmap]:
+    with open(path, "rb") as fin:
+        # Empty files cannot be mapped
+        if os.fstat(fin.fileno()).st_size == 0:
+            yield b""
+            return
+
+        with mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield buffer
+
+
+def decode(inputs: str | Buffer) -> str:
+    if isinstance(inputs, str):
+        return inputs
+
+    return str(inputs, "utf-8")
+
+
+def _split(inputs: str | Buffer, sep: str) -> Iterator[str | bytes]:
+    # Only the current field is ever copied out of the buffer
+    if isinstance(inputs, memoryview):
+        inputs = inputs.obj if inputs.nbytes == len(inputs.obj) else bytes(inputs)
+
+    if isinstance(inputs, str):
+        separator = sep
+    else:
+        separator = sep.encode()
+
+    begin = 0
+    end = len(inputs)
+    while begin < end:
+        idx = inputs.find(separator, begin)
+        if idx < 0:
+            idx = end
+
+        yield inputs[begin:idx]
+        begin = idx + len(separator)
+
+
+def iter_split(inputs: str | Buffer, sep: str) -> Iterator[str]:
+    if isinstance(inputs, str):
+        # The text is in memory already, and splitting it in one go is several times
+        # faster than the lazy path. Like that path, a trailing separator does not
+        # start another field
+        fields = inputs.split(sep)
+        if not fields[-1]:
+            fields.pop()
+        return iter(fields)
+
+    return (
+        field if isinstance(field, str) else field.decode()
+        for field in _split(inputs, sep)
+    )
+
+
+def iter_lines(inputs: Inputs) -> Iterator[str]:
+    if isinstance(inputs, str):
+        lines = iter_split(inputs, "\n")
+        if "\r" in inputs:
+            return (line.removesuffix("\r") for line in lines)
+        return lines
+
+    return _iter_lines(inputs)
+
+
+def _iter_lines(inputs: Buffer | Iterable[str] | Iterable[bytes]) -> Iterator[str]:
+    if isinstance(inputs, Buffer):
+        for line in iter_split(inputs, "\n"):
+            yield line.removesuffix("\r")
+        return
+
+    # File objects, sockets and generators yielding one line at a time
+    for line in inputs:
+        if not isinstance(line, str):
+            line = line.decode()
+        yield line.removesuffix("\n").removesuffix("\r")
+
+
+def iter_byte_lines(inputs: Inputs) -> Iterator[bytes]:
+    if isinstance(inputs, Buffer):
+        for line in _split(inputs, "\n"):
+            yield bytes(line).removesuffix(b"\r")
+        return
+
+    if isinstance(inputs, str):
+        inputs = iter_split(inputs, "\n")
+
+    for line in inputs:
+        if isinstance(line, str):
+            line = line.encode()
+        yield line.removesuffix(b"\n").removesuffix(b"\r")
+
+
+def test_choose_backend() -> None:
+    assert choose_backend("python", NUMPY_MIN_ITEMS) == "python"
+    assert choose_backend("numpy", 0) == "numpy"
+    assert choose_backend("auto", NUMPY_MIN_ITEMS - 1) == "python"
+    expected = "numpy" if has_numpy() else "python"
+    assert choose_backend("auto", NUMPY_MIN_ITEMS) == expected
+
+
+def test_iter_lines(tmp_path: Path) -> None:
+    path = tmp_path / "inputs.txt"
+    path.write_bytes(b"ab\r\n\ncd\nef\n")
+
+    with open_input(path) as buffer:
+        assert list(iter_lines(buffer)) == ["ab", "", "cd", "ef"]
+        assert list(iter_lines(memoryview(buffer))) == ["ab", "", "cd", "ef"]
+        assert list(iter_lines(decode(buffer))) == ["ab", "", "cd", "ef"]
+
+
+def test_iter_lines_iterable(tmp_path: Path) -> None:
+    path = tmp_path / "inputs.txt"
+    path.write_bytes(b"ab\r\n\ncd\nef")
+
+    with open(path) as fin:
+        assert list(iter_lines(fin)) == ["ab", "", "cd", "ef"]
+
+    with open(path, "rb") as fin:
+        assert list(iter_lines(fin)) == ["ab", "", "cd", "ef"]
+
+    assert list(iter_lines(line for line in ["ab", "cd"])) == ["ab", "cd"]
+
+
+def test_iter_byte_lines() -> None:
+    expected = [b"ab", b"", b"cd"]
+    assert list(iter_byte_lines(b"ab\r\n\ncd\n")) == expected
+    assert list(iter_byte_lines("ab\r\n\ncd\n")) == expected
+    assert list(iter_byte_lines(["ab\n", "\n", "cd"])) == expected
+
+
+def test_iter_split() -> None:
+    assert list(iter_split(b"a,b,,c\n", ",")) == ["a", "b", "", "c\n"]
+    assert list(iter_split("a,b", ",")) == ["a", "b"]
+
+    # Strings are split in one go, with the same fields as the lazy path
+    for inputs in ("", "a", "a,", "a,,b", ",a,,", "a\r,b"):
+        assert list(iter_split(inputs, ",")) == list(iter_split(inputs.encode(), ","))
+
+
+def test_open_empty_input(tmp_path: Path) -> None:
+    path = tmp_path / "inputs.txt"
+    path.touch()
+
+    with open_input(path) as buffer:
+        assert list(iter_lines(buffer)) == []
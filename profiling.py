@@ -0,0 +1,202 @@
+import contextlib
+import functools
+import time
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterator, TypeVar
+
+if TYPE_CHECKING:
+    import cProfile
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# `inspect.CO_GENERATOR`, inspect itself is too slow to import on every solver
+CO_GENERATOR = 0x20
+
+# Instrumented code only checks these flags, so disabled hooks cost a global lookup
+_enabled = False
+_timing = False
+counters: Counter[str] = Counter()
+timings: Counter[str] = Counter()
+
+# Time spent in `timed` functions, counting only the outermost of nested calls
+total_time = 0.0
+_depth = 0
+
+
+def enable(flag: bool = True) -> None:
+    # Counters and the per-function timings
+    global _enabled
+    _enabled = flag
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable_timing(flag: bool = True) -> None:
+    # Only `total_time`, cheap enough for every run
+    global _timing
+    _timing = flag
+
+
+def reset() -> None:
+    global total_time
+
+    counters.clear()
+    timings.clear()
+    total_time = 0.0
+
+
+def _record(name: str, elapsed: float) -> None:
+    global total_time
+
+    if _depth == 0:
+        total_time += elapsed
+    if _enabled:
+        timings[name] += elapsed
+
+
+def count(name: str, n: int = 1) -> None:
+    if _enabled:
+        counters[name] += n
+
+
+@contextlib.contextmanager
+def timer(name: str) -> Iterator[None]:
+    if not _enabled:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] += time.perf_counter() - start
+
+
+def timed(func: F) -> F:
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    # No context managers on this path, it runs for every generated item
+    if func.__code__.co_flags & CO_GENERATOR:
+
+        @functools.wraps(func)
+        def generator_wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not (_timing or _enabled):
+                return func(*args, **kwargs)
+
+            # Only the time spent producing items is attributed to the generator
+            def timed_generator() -> Iterator[Any]:
+                global _depth
+
+                generator = func(*args, **kwargs)
+                while True:
+                    _depth += 1
+                    start = time.perf_counter()
+                    try:
+                        item = next(generator)
+                    except StopIteration as e:
+                        return e.value
+                    finally:
+                        _depth -= 1
+                        _record(name, time.perf_counter() - start)
+                    yield item
+
+            return timed_generator()
+
+        return generator_wrapper  # type: ignore[return-value]
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        global _depth
+
+        if not (_timing or _enabled):
+            return func(*args, **kwargs)
+
+        _depth += 1
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _depth -= 1
+            _record(name, time.perf_counter() - start)
+
+    return wrapper  # type: ignore[return-value]
+
+
+@contextlib.contextmanager
+def profile(path: Path) -> Iterator["cProfile.Profile"]:
+    # Only imported when profiling, solvers import this module on every run
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(path)
+
+
+def test_disabled() -> None:
+    reset()
+    count("calls")
+    with timer("block"):
+        pass
+
+    assert counters == Counter()
+    assert timings == Counter()
+    assert total_time == 0.0
+
+
+def test_timed() -> None:
+    @timed
+    def numbers(n: int) -> Iterator[int]:
+        for i in range(n):
+            count("numbers")
+            yield i
+
+    @timed
+    def total(n: int) -> int:
+        return sum(numbers(n))
+
+    try:
+        enable()
+        reset()
+        assert total(4) == 6
+        assert counters["numbers"] == 4
+        assert set(timings) == {
+            f"{__name__}.test_timed.<locals>.numbers",
+            f"{__name__}.test_timed.<locals>.total",
+        }
+    finally:
+        enable(False)
+        reset()
+
+
+def test_total_time() -> None:
+    @timed
+    def inner() -> None:
+        time.sleep(0.01)
+
+    @timed
+    def outer() -> None:
+        inner()
+
+    try:
+        enable_timing()
+        reset()
+        start = time.perf_counter()
+        outer()
+        inner()
+        wall_time = time.perf_counter() - start
+
+        # Counting the nested call too would add another 0.01
+        assert 0.02 <= total_time <= wall_time
+        assert timings == Counter()
+    finally:
+        enable_timing(False)
+        reset()
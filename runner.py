@@ -0,0 +1,399 @@
+#!/usr/bin/env python
+import argparse
+import contextlib
+import csv
+import importlib
+import inspect
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Sequence, TextIO
+
+import cache
+import loader
+import profiling
+
+
+ROOT = Path(__file__).resolve().parent
+DAYS = sorted(path.stem for path in ROOT.glob("day[0-9][0-9].py"))
+PHASES = ("part1", "part2")
+
+
+@dataclass
+class Measurement:
+    day: str
+    input: str
+    phase: str
+    wall_time: float
+    cpu_time: float
+    result: str | None = None
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class Task:
+    day: str
+    path: Path
+    phases: tuple[str, ...] = PHASES
+    profile: bool = False
+    pstats_dir: Path | None = None
+
+
+def measure(func: Callable[..., Any], *args: Any) -> tuple[Any, float, float]:
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    result = func(*args)
+    cpu_time = time.process_time() - cpu_start
+    wall_time = time.perf_counter() - wall_start
+
+    return result, wall_time, cpu_time
+
+
+def prepare(module: ModuleType, inputs: str | loader.Buffer) -> Any:
+    # Produces what is timed as the "parse" phase. Only day02 is really parsed
+    # here and day03 split into lines. All other days parse inside `partN`, that
+    # time is reported as "partN:parse" and the rest as "partN:solve"
+    match module.__name__:
+        case "day01" | "day04" | "day09" | "day15":
+            return inputs
+        case "day07":
+            # Building or mapping the hand tables is setup, keep it out of `partN`
+            for rules in ("standard", "joker"):
+                module.hand_table(rules)
+            return inputs
+        case "day02":
+            return module.parse(inputs)
+        case "day03":
+            return loader.decode(inputs).splitlines()
+        case _:
+            return loader.decode(inputs)
+
+
+def takes_input(func: Callable[..., Any]) -> bool:
+    parameters = inspect.signature(func).parameters.values()
+    return any(p.default is inspect.Parameter.empty for p in parameters)
+
+
+def run_day(
+    day: str,
+    path: Path,
+    phases: Sequence[str] = PHASES,
+    profile: bool = False,
+    pstats_dir: Path | None = None,
+) -> list[Measurement]:
+    module = importlib.import_module(day)
+    if cache.cache_directory() is not None:
+        # Hashes the solver sources once per process, outside of the timed phases
+        cache.source_digest(day)
+
+    parts = [
+        (phase, getattr(module, phase)) for phase in phases if hasattr(module, phase)
+    ]
+    measurements = []
+
+    def record(phase: str, func: Callable[..., Any], *args: Any) -> Any:
+        profiling.reset()
+        with contextlib.ExitStack() as profilers:
+            if pstats_dir is not None:
+                pstats_path = pstats_dir / f"{day}-{path.stem}-{phase}.pstats"
+                profilers.enter_context(profiling.profile(pstats_path))
+
+            try:
+                result, wall_time, cpu_time = measure(func, *args)
+            except Exception as e:
+                measurements.append(
+                    Measurement(day, str(path), phase, 0.0, 0.0, error=repr(e))
+                )
+                raise
+
+        measurement = Measurement(day, str(path), phase, wall_time, cpu_time)
+        measurements.append(measurement)
+        if phase.startswith("part"):
+            measurement.result = str(result)
+
+            # Time in the `timed` parse functions, split off from the solving
+            parse_time = min(profiling.total_time, wall_time)
+            solve_time = wall_time - parse_time
+            measurements.append(
+                Measurement(day, str(path), f"{phase}:parse", parse_time, 0.0)
+            )
+            measurements.append(
+                Measurement(day, str(path), f"{phase}:solve", solve_time, 0.0)
+            )
+
+        # Hot-path counters and timers are reported as sub-phases
+        for name, value in sorted(profiling.counters.items()):
+            measurements.append(
+                Measurement(day, str(path), f"{phase}:{name}", 0.0, 0.0, str(value))
+            )
+        for name, wall_time in sorted(profiling.timings.items()):
+            measurements.append(
+                Measurement(day, str(path), f"{phase}:{name}", wall_time, 0.0)
+            )
+
+        return result
+
+    profiling.enable(profile)
+    profiling.enable_timing()
+
+    # Solvers print debugging output, keep it out of the report
+    with contextlib.redirect_stdout(sys.stderr), contextlib.ExitStack() as stack:
+        stack.callback(profiling.enable, False)
+        stack.callback(profiling.enable_timing, False)
+
+        parsed = None
+        if any(takes_input(part) for _, part in parts):
+            try:
+                inputs = record("load", stack.enter_context, loader.open_input(path))
+                parsed = record("parse", prepare, module, inputs)
+            except Exception:
+                return measurements
+
+        for phase, part in parts:
+            args = (parsed,) if takes_input(part) else ()
+            with contextlib.suppress(Exception):
+                record(phase, part, *args)
+
+    return measurements
+
+
+def run_task(task: Task) -> list[Measurement]:
+    return run_day(task.day, task.path, task.phases, task.profile, task.pstats_dir)
+
+
+def run_tasks(tasks: Sequence[Task], jobs: int = 1) -> list[Measurement]:
+    if jobs == 1:
+        results = list(map(run_task, tasks))
+    else:
+        # `map` yields in submission order, so the report order is deterministic
+        with ProcessPoolExecutor(max_workers=jobs or None) as executor:
+            results = list(executor.map(run_task, tasks))
+
+    return [m for measurements in results for m in measurements]
+
+
+def input_paths(day: str, input_dir: Path, pattern: str = "{day}.txt") -> list[Path]:
+    pattern = pattern.format(day=day)
+    paths = sorted(input_dir.glob(pattern))
+
+    # Keep the missing file around so that it shows up as an error in the report
+    return paths or [input_dir / pattern]
+
+
+def make_tasks(
+    days: Sequence[str],
+    input_dir: Path,
+    pattern: str = "{day}.txt",
+    profile: bool = False,
+    pstats_dir: Path | None = None,
+) -> list[Task]:
+    # One task per input file, so that every input is loaded and parsed once
+    return [
+        Task(day, path, PHASES, profile, pstats_dir)
+        for day in days
+        for path in input_paths(day, input_dir, pattern)
+    ]
+
+
+def job_count(value: str) -> int:
+    jobs = int(value)
+    if jobs < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {jobs}")
+
+    return jobs
+
+
+def write_text(measurements: list[Measurement], fout: TextIO) -> None:
+    for m in measurements:
+        outcome = m.error or m.result or ""
+        fout.write(
+            f"{m.day} {Path(m.input).name:<12} {m.phase:<11} "
+            f"{1e3 * m.wall_time:10.3f} ms wall "
+            f"{1e3 * m.cpu_time:10.3f} ms cpu  {outcome}\n"
+        )
+
+
+def write_json(rows: Sequence[Any], fout: TextIO) -> None:
+    json.dump([asdict(row) for row in rows], fout, indent=2)
+    fout.write("\n")
+
+
+def write_csv(rows: Sequence[Any], fout: TextIO) -> None:
+    if not rows:
+        return
+
+    writer = csv.DictWriter(fout, fieldnames=[f.name for f in fields(rows[0])])
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(asdict(row))
+
+
+WRITERS = {"text": write_text, "json": write_json, "csv": write_csv}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Run and time the daily solvers",
+        epilog="Only day02 and day03 are parsed in the parse phase, the other days "
+        "parse within part1/part2, reported as partN:parse and partN:solve.",
+    )
+    parser.add_argument("days", nargs="*", metavar="day")
+    parser.add_argument("--input-dir", type=Path, default=ROOT / "inputs")
+    parser.add_argument(
+        "--pattern",
+        default="{day}.txt",
+        help="glob for the input files of a day, relative to the input directory",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=job_count,
+        default=1,
+        help="number of worker processes, 0 for one per CPU",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        help="reuse results from this directory, their times are then lookups, "
+        f"also enabled by setting {cache.CACHE_DIR_ENV}",
+    )
+    parser.add_argument("--cache-max-bytes", type=int, default=cache.cache_max_bytes())
+    parser.add_argument(
+        "--no-cache", action="store_true", help="bypass the result cache"
+    )
+    parser.add_argument(
+        "--profile", action="store_true", help="report hot-path counters and timers"
+    )
+    parser.add_argument(
+        "--pstats-dir", type=Path, help="dump a cProfile stats file per phase"
+    )
+    parser.add_argument("--format", choices=WRITERS, default="text")
+    parser.add_argument("--output", type=argparse.FileType("w"), default=sys.stdout)
+    args = parser.parse_args(argv)
+
+    unknown = [day for day in args.days if day not in DAYS]
+    if unknown:
+        parser.error(f"unknown days: {', '.join(unknown)}")
+
+    # Cached results would stand in for the timings, so caching is opt-in. Also
+    # clears a cache directory inherited from the environment
+    if args.no_cache:
+        cache.configure(None)
+    elif args.cache_dir is not None:
+        cache.configure(args.cache_dir, args.cache_max_bytes)
+    elif cache.cache_directory() is not None:
+        cache.configure(cache.cache_directory(), args.cache_max_bytes)
+
+    tasks = make_tasks(
+        args.days or DAYS,
+        args.input_dir,
+        args.pattern,
+        profile=args.profile,
+        pstats_dir=args.pstats_dir,
+    )
+    measurements = run_tasks(tasks, jobs=args.jobs)
+
+    WRITERS[args.format](measurements, args.output)
+
+
+def test_run_day(tmp_path: Path) -> None:
+    import day04
+
+    path = tmp_path / "day04.txt"
+    path.write_text(day04.TEST_INPUT)
+
+    measurements = run_day("day04", path)
+    assert [m.phase for m in measurements] == [
+        "load",
+        "parse",
+        "part1",
+        "part1:parse",
+        "part1:solve",
+        "part2",
+        "part2:parse",
+        "part2:solve",
+    ]
+    assert [m.result for m in measurements if m.result] == ["13", "30"]
+
+    part1, parse, solve = measurements[2:5]
+    assert parse.wall_time > 0.0
+    assert abs(parse.wall_time + solve.wall_time - part1.wall_time) < 1e-9
+
+
+def test_run_day_profile(tmp_path: Path) -> None:
+    import test_day12
+
+    path = tmp_path / "day12.txt"
+    path.write_text("\n".join(inputs for inputs, _ in test_day12.TEST_INPUTS))
+
+    measurements = run_day("day12", path, ("part1",), True, tmp_path / "pstats")
+    phases = [m.phase for m in measurements]
+    assert "parse:day12.parse" not in phases
+    assert "part1:day12.count_arrangements.hits" in phases
+    assert "part1:day12.count_arrangements.misses" in phases
+    assert "part1:day12.parse" in phases
+    assert (tmp_path / "pstats" / "day12-day12-part1.pstats").exists()
+
+
+def test_run_tasks_parallel(tmp_path: Path) -> None:
+    import day04
+    import test_day15
+
+    (tmp_path / "day04.txt").write_text(day04.TEST_INPUT)
+    (tmp_path / "day04_copy.txt").write_text(day04.TEST_INPUT)
+    (tmp_path / "day15.txt").write_text(test_day15.TEST_INPUT)
+
+    tasks = make_tasks(["day04", "day15"], tmp_path, "{day}*.txt")
+    assert len(tasks) == 3
+
+    serial = run_tasks(tasks)
+    parallel = run_tasks(tasks, jobs=2)
+    assert [(m.input, m.phase, m.result) for m in parallel] == [
+        (m.input, m.phase, m.result) for m in serial
+    ]
+    assert [m.result for m in parallel if m.result is not None] == [
+        "13", "30", "13", "30", "1320", "145"
+    ]
+
+    # Each input is loaded and parsed once
+    loads = [(m.input, m.phase) for m in parallel if m.phase in ("load", "parse")]
+    assert len(loads) == len(set(loads)) == 6
+
+
+def test_job_count() -> None:
+    import pytest
+
+    assert job_count("0") == 0
+    assert job_count("4") == 4
+    with pytest.raises(argparse.ArgumentTypeError):
+        job_count("-1")
+
+
+def test_main_cache_opt_in(tmp_path: Path, monkeypatch: Any) -> None:
+    import day04
+
+    (tmp_path / "day04.txt").write_text(day04.TEST_INPUT)
+    argv = ["day04", "--input-dir", str(tmp_path), "--output", str(tmp_path / "out")]
+    monkeypatch.delenv(cache.CACHE_DIR_ENV, raising=False)
+    try:
+        cache.configure(None)
+        main(argv)
+        assert cache.cache_directory() is None
+
+        main(argv + ["--cache-dir", str(tmp_path / "cache")])
+        assert len(list((tmp_path / "cache").glob("*.pickle"))) == 2
+    finally:
+        cache.configure(None)
+
+
+def test_run_day_missing_input(tmp_path: Path) -> None:
+    (measurement,) = run_day("day04", tmp_path / "day04.txt")
+    assert measurement.phase == "load"
+    assert measurement.error is not None
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+from itertools import product
+from string import ascii_uppercase, digits
+
+import pytest
+
+from day08 import Cycle, Network, find_cycle, parse, part1, part2
+
+
+TEST_INPUT_1 = """\
+RL
+
+AAA = (BBB, CCC)
+BBB = (DDD, EEE)
+CCC = (ZZZ, GGG)
+DDD = (DDD, DDD)
+EEE = (EEE, EEE)
+GGG = (GGG, GGG)
+ZZZ = (ZZZ, ZZZ)"""
+
+
+TEST_INPUT_2 = """\
+LLR
+
+AAA = (BBB, BBB)
+BBB = (AAA, ZZZ)
+ZZZ = (ZZZ, ZZZ)"""
+
+TEST_INPUT_3 = """\
+LR
+
+11A = (11B, XXX)
+11B = (XXX, 11Z)
+11Z = (11B, XXX)
+22A = (22B, XXX)
+22B = (22C, 22C)
+22C = (22Z, 22Z)
+22Z = (22B, 22B)
+XXX = (XXX, XXX)"""
+
+
+@pytest.mark.parametrize(
+    "input,expected",
+    [
+        (TEST_INPUT_1, 2),
+        (TEST_INPUT_2, 6),
+    ],
+    ids=["TEST_INPUT_1", "TEST_INPUT_2"],
+)
+def test_part1(input: str, expected: int) -> None:
+    assert part1(input) == expected
+
+
+def test_part2() -> None:
+    assert part2(TEST_INPUT_3) == 6
+
+
+def test_cycle_start0_len3() -> None:
+    test_input = """\
+LLL
+
+AAA = (BBB, XXX)
+BBB = (CCC, XXX)
+CCC = (AAA, XXX)"""
+    network = Network.compile(*parse(test_input))
+    assert find_cycle(network.ids["AAA"], network) == Cycle(0, 3, [])
+
+
+def test_cycle_start2_len12() -> None:
+    test_input = """\
+LLL
+
+AAA = (BBB, XXX)
+BBB = (CCC, XXX)
+CCC = (DDD, XXX)
+DDD = (EEE, XXX)
+EEE = (FFF, XXX)
+FFF = (CCC, XXX)"""
+    network = Network.compile(*parse(test_input))
+    assert find_cycle(network.ids["AAA"], network) == Cycle(2, 12, [])
+
+
+def test_cycle_end_offsets() -> None:
+    network = Network.compile(*parse(TEST_INPUT_3))
+    assert find_cycle(network.ids["11A"], network) == Cycle(1, 2, [1])
+    assert find_cycle(network.ids["22A"], network) == Cycle(1, 6, [2, 5])
+
+
+def test_long_cycle() -> None:
+    names = ["".join(name) for name in product(ascii_uppercase + digits, repeat=3)]
+    lines = [f"{a} = ({b}, {b})" for a, b in zip(names, names[1:] + names[:1])]
+    network = Network.compile(*parse("LR\n\n" + "\n".join(lines)))
+    end_offsets = [i for i, name in enumerate(names) if name.endswith("Z")]
+    assert find_cycle(0, network) == Cycle(0, len(names), end_offsets)
+
+
+def test_network_compile() -> None:
+    network = Network.compile(*parse(TEST_INPUT_2))
+    assert network.directions == b"\x00\x00\x01"
+    assert network.names == ["AAA", "BBB", "ZZZ"]
+    assert network.successors == [1, 1, 0, 2, 2, 2]
+
+    with pytest.raises(RuntimeError):
+        Network.compile("LXR", {})
@@ -0,0 +1,42 @@
+import pytest
+
+from day09 import forecast, parse, part1, part2
+
+
+TEST_1 = "0 3 6 9 12 15"
+TEST_2 = "1 3 6 10 15 21"
+TEST_3 = "10 13 16 21 30 45"
+
+
+@pytest.mark.parametrize(
+    "inputs,expected",
+    [(TEST_1, 18), (TEST_2, 28), (TEST_3, 68)],
+    ids=["case1", "case2", "case3"],
+)
+def test_forecast(inputs: str, expected: int) -> None:
+    (history,) = parse(inputs)
+    assert forecast(history) == expected
+
+
+def test_part1() -> None:
+    inputs = "\n".join([TEST_1, TEST_2, TEST_3])
+    assert part1(inputs) == 114
+
+
+def test_part1_streaming() -> None:
+    assert part1(line for line in [TEST_1, TEST_2, TEST_3]) == 114
+
+
+@pytest.mark.parametrize(
+    "inputs,expected",
+    [(TEST_1, -3), (TEST_2, 0), (TEST_3, 5)],
+    ids=["case1", "case2", "case3"],
+)
+def test_backcast(inputs: str, expected: int) -> None:
+    (history,) = parse(inputs)
+    assert forecast(history, backwards=True) == expected
+
+
+def test_part2() -> None:
+    inputs = "\n".join([TEST_1, TEST_2, TEST_3])
+    assert part2(inputs) == 2
@@ -0,0 +1,36 @@
+import pytest
+
+from day12 import count_arrangements, parse
+
+
+TEST_INPUTS = [
+    ("#.#.### 1,1,3", 1),
+    ("???.### 1,1,3", 1),
+    (".??..??...?##. 1,1,3", 4),
+    ("?#?#?#?#?#?#?#? 1,3,1,6", 1),
+    ("????.#...#... 4,1,1", 1),
+    ("????.######..#####. 1,6,5", 4),
+    ("?###???????? 3,2,1", 10),
+]
+
+
+@pytest.mark.parametrize("inputs, expected", TEST_INPUTS)
+def test_count_arrangements(inputs: str, expected: int) -> None:
+    record, runs = next(parse(inputs))
+    assert count_arrangements(record, runs) == expected
+
+
+TEST_INPUTS_PT2 = [
+    ("???.### 1,1,3", 1),
+    (".??..??...?##. 1,1,3", 16384),
+    ("?#?#?#?#?#?#?#? 1,3,1,6", 1),
+    ("????.#...#... 4,1,1", 16),
+    ("????.######..#####. 1,6,5", 2500),
+    ("?###???????? 3,2,1", 506250),
+]
+
+
+@pytest.mark.parametrize("inputs, expected", TEST_INPUTS_PT2)
+def test_count_arrangements_pt2(inputs: str, expected: int) -> None:
+    record, runs = next(parse(inputs))
+    assert count_arrangements("?".join(5 * [record]), 5 * runs) == expected
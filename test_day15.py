@@ -0,0 +1,36 @@
+from collections import OrderedDict
+
+import pytest
+
+from day15 import aoc_hash, part1, part2, run_instructions
+
+
+@pytest.mark.parametrize(
+    "string, expected",
+    [
+        ("HASH", 52),
+        ("rn=1", 30),
+        ("cm-", 253),
+        ("qp=3", 97),
+        ("pc-", 48),
+    ],
+)
+def test_hash(string: str, expected: int) -> None:
+    assert aoc_hash(string) == expected
+
+
+TEST_INPUT = "rn=1,cm-,qp=3,cm=2,qp-,pc=4,ot=9,ab=5,pc-,pc=6,ot=7"
+
+
+def test_part1() -> None:
+    assert part1(TEST_INPUT) == 1320
+
+
+def test_run_instructions() -> None:
+    boxes = run_instructions(TEST_INPUT)
+    assert boxes[0] == OrderedDict(rn=1, cm=2)
+    assert boxes[3] == OrderedDict(ot=7, ab=5, pc=6)
+
+
+def test_part2() -> None:
+    assert part2(TEST_INPUT) == 145